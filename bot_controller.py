@@ -14,6 +14,7 @@ from datetime import datetime, timedelta
 from datetime import time as time_class
 from typing import Dict, List, Optional, Tuple, Any, Union
 from urllib.parse import urlparse
+from dataclasses import dataclass
 from PIL import Image
 from functools import lru_cache
 from bs4 import BeautifulSoup
@@ -24,6 +25,14 @@ from state_manager import StateManager
 
 logger = logging.getLogger('bot.controller')
 
+@dataclass(slots=True, frozen=True)
+class RssFeed:
+    """Статус RSS-ленты для отображения в интерфейсе"""
+    url: str
+    active: bool = True
+    error_count: int = 0
+    last_check: Optional[Any] = None
+
 class BotController:
     def __init__(self, config, state_manager, rss_parser, image_generator, yandex_gpt, telegram_bot):
         self.config = config
@@ -1585,29 +1594,21 @@ class BotController:
         
         return changed
     
-    def get_rss_status(self) -> List[Dict]:
+    def get_rss_status(self) -> List[RssFeed]:
         """Возвращает статус с учетом активности"""
-        status_list = []
-        
-        for i, url in enumerate(self.config.RSS_URLS):
-            status = {
-                'url': url,
-                'active': self.config.RSS_ACTIVE[i],
-                'error_count': 0,
-                'last_check': None
-            }
-            
-            # Получаем количество ошибок
-            if hasattr(self.rss_parser, 'get_error_count'):
-                status['error_count'] = self.rss_parser.get_error_count(url)
-            
-            # Получаем время последней проверки
-            if hasattr(self.rss_parser, 'get_last_check'):
-                status['last_check'] = self.rss_parser.get_last_check(url)
-            
-            status_list.append(status)
-        
-        return status_list
+        # Получаем количество ошибок и время последней проверки, если парсер их поддерживает
+        get_error_count = getattr(self.rss_parser, 'get_error_count', None)
+        get_last_check = getattr(self.rss_parser, 'get_last_check', None)
+        
+        return [
+            RssFeed(
+                url=url,
+                active=bool(self.config.RSS_ACTIVE[i]),
+                error_count=get_error_count(url) if get_error_count else 0,
+                last_check=get_last_check(url) if get_last_check else None
+            )
+            for i, url in enumerate(self.config.RSS_URLS)
+        ]
             
     async def show_ai_settings(self, callback: CallbackQuery) -> None:
         """Показывает настройки AI (перенаправляем в Telegram интерфейс)"""
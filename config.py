@@ -10,6 +10,7 @@ import time
 import traceback
 from typing import Dict, Any, List, Optional, Tuple, Union
 import sys
+import threading
 from dotenv import load_dotenv
 from telegram import CallbackQuery
 import validators
@@ -18,6 +19,9 @@ import colorama
 load_dotenv()
 colorama.init()
 
+# Сериализует чтение-изменение-запись .env: его вызывают и цикл событий, и фоновые потоки
+_ENV_FILE_LOCK = threading.Lock()
+
 class StructuredFormatter(logging.Formatter):
     """Умный форматтер логов с адаптивным выводом для разных режимов"""
     
@@ -296,6 +300,29 @@ logger = get_logger('ConfigManager')
 
 class Config:
     """Класс для управления конфигурацией приложения"""
+    # Фиксированный набор атрибутов: доступ через слоты быстрее, чем через __dict__
+    __slots__ = (
+        'logger', 'controller',
+        'DEBUG_MODE', 'TIMEZONE', 'NOTIFY_LEVEL', 'NOTIFY_TYPES',
+        'TOKEN', 'CHANNEL_ID', 'OWNER_ID',
+        'CHECK_INTERVAL', 'MAX_ENTRIES_HISTORY', 'RSS_URLS', 'RSS_ACTIVE',
+        'PUBLICATION_MODE', 'MIN_DELAY_BETWEEN_POSTS', 'PUBLICATION_SCHEDULE',
+        'YANDEX_API_KEY', 'YANDEX_FOLDER_ID', 'YANDEX_API_ENDPOINT',
+        'ENABLE_YAGPT', 'YAGPT_MODEL', 'YAGPT_TEMPERATURE', 'YAGPT_MAX_TOKENS',
+        'YAGPT_PROMPT', 'YAGPT_ERROR_THRESHOLD', 'AUTO_ENABLE_YAGPT', 'YAGPT_CACHE_TTL',
+        'MAX_CONCURRENT_GPT_REQUESTS',
+        'MIN_TITLE_LENGTH', 'MAX_TITLE_LENGTH', 'MIN_DESC_LENGTH', 'MAX_DESC_LENGTH',
+        'ENABLE_IMAGE_GENERATION', 'FONTS_DIR', 'TEMPLATES_DIR', 'OUTPUT_DIR',
+        'DEFAULT_FONT', 'MAX_IMAGE_WIDTH', 'MAX_IMAGE_HEIGHT', 'TEXT_COLOR',
+        'STROKE_COLOR', 'STROKE_WIDTH', 'TEXT_POSITION', 'TEXT_ALIGN', 'MAX_TEXT_LINES',
+        'ENABLE_BOT_CONTROL', 'STATE_FILE', 'PROXY_URL', 'RSS_REQUEST_DELAY',
+        'MAX_POSTS_PER_CYCLE', 'IMAGE_GENERATION_WORKERS', 'POSTS_PER_HOUR',
+        'IMAGE_SOURCE', 'IMAGE_FALLBACK',
+        'MAX_SIMILAR_TITLE_CHECK', 'TITLE_SIMILARITY_THRESHOLD', 'REQUIRE_IMAGE_UNIQUENESS',
+        'IMAGE_DOWNLOAD_TIMEOUT', 'MIN_IMAGE_WIDTH', 'MIN_IMAGE_HEIGHT',
+        'MAX_CONCURRENT_IMAGE_TASKS',
+    )
+
     def __init__(self):
         # Инициализация логгера с контекстом
         self.logger = get_logger('Config', {'context_module': 'config'})
@@ -370,6 +397,7 @@ class Config:
         )
         self.YAGPT_ERROR_THRESHOLD: int = self.get_env_var('YAGPT_ERROR_THRESHOLD', default=5, var_type=int)
         self.AUTO_ENABLE_YAGPT: bool = self.get_env_var('AUTO_ENABLE_YAGPT', default=True, var_type=bool)
+        self.YAGPT_CACHE_TTL: int = self.get_env_var('YAGPT_CACHE_TTL', default=3600, var_type=int)
         # В config.py
         self.MAX_CONCURRENT_GPT_REQUESTS = int(os.getenv('MAX_CONCURRENT_GPT_REQUESTS', 3))
 
@@ -541,6 +569,11 @@ class Config:
             self.logger.warning(".env file not found, skipping save")
             return
         
+        with _ENV_FILE_LOCK:
+            self._write_env_param(env_file, param, value)
+
+    def _write_env_param(self, env_file: str, param: str, value: str) -> None:
+        """Заменяет или добавляет строку параметра в .env (вызывается под _ENV_FILE_LOCK)"""
         try:
             # Создаем резервную копию
             backup_file = '.env.bak'
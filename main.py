@@ -25,6 +25,11 @@ from visual_interface import UIBuilder
 from typing import Optional, Dict, Any, Union
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 
+try:
+    import uvloop
+except ImportError:  # uvloop недоступен (например, на Windows)
+    uvloop = None
+
 logger = logging.getLogger('AsyncMain')
 load_dotenv()
 
@@ -221,6 +226,8 @@ async def run_bot():
         rss_parser = AsyncRSSParser(session, config.PROXY_URL)
         
         # Инициализация YandexGPT и генератора изображений
+        # Общая сессия создана без лимита соединений (limit=0), поэтому параллельные запросы
+        # enhance_many не упираются в коннектор; для отдельной сессии см. AsyncYandexGPT.make_session
         yandex_gpt = AsyncYandexGPT(config, session)
         image_generator = AsyncImageGenerator(config)
         logger.info("All components initialized")
@@ -400,6 +407,10 @@ async def check_internet_connection(session):
         await asyncio.sleep(60)
         
 if __name__ == "__main__":
+    # Используем uvloop, если он установлен
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     # Создаем новый цикл событий
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
@@ -1,4 +1,6 @@
 import asyncio
+import contextlib
+import functools
 from collections import deque
 import json
 import os
@@ -19,12 +21,87 @@ from visual_interface import UIBuilder
 from aiogram.types import BufferedInputFile
 from aiogram.types import Message as TelegramMessage
 from aiogram.exceptions import TelegramBadRequest
+from aiogram.client.session.aiohttp import AiohttpSession
+
+try:
+    import orjson
+except ImportError:  # orjson не установлен - используется стандартный json
+    orjson = None
 
 
 logger = logging.getLogger('AsyncTelegramBot')
 
+# Строковые значения, трактуемые как True при разборе булевых параметров
+_TRUTHY = frozenset({'true', '1', 'yes', 'y', 't', 'on'})
+
+# Значения-кортежи: целые числа через запятую (например, цвет "255, 255, 255")
+_INT_TUPLE_RE = re.compile(r'\s*-?\d+(?:\s*,\s*-?\d+)*\s*')
+_INT_RE = re.compile(r'-?\d+')
+
+# Параметры, изменение которых может потребовать перезапуска бота
+_CRITICAL_PARAMS = frozenset({'TOKEN', 'CHANNEL_ID', 'OWNER_ID', 'YANDEX_API_KEY'})
+
+# Описания типов и примеры значений для /param_info
+_TYPE_DESCRIPTIONS = {
+    'int': 'целое число',
+    'float': 'число с плавающей точкой',
+    'bool': 'логическое значение (true/false)',
+    'str': 'строка',
+    'list': 'список значений (через запятую)',
+    'tuple': 'кортеж чисел (через запятую)'
+}
+_TYPE_EXAMPLES = {
+    int: "42",
+    float: "3.14",
+    bool: "true или false",
+    str: "любая строка",
+    list: "item1, item2, item3",
+    tuple: "255, 255, 255"
+}
+
+# Шаблоны ответов команд /param_info и /set_all
+_PARAM_INFO_TPL = (
+    "ℹ️ <b>Информация о параметре:</b>\n\n"
+    "<b>Имя:</b> {name}\n"
+    "<b>Тип:</b> {tname} ({tdesc})\n"
+    "<b>Текущее значение:</b> {value}\n\n"
+    "<b>Примеры значений:</b>\n"
+    "{examples}\n\n"
+    "<b>Изменить командой:</b>\n"
+    "<code>/set_all {name} [новое_значение]</code>"
+)
+_SET_ALL_OK_TPL = (
+    "✅ <b>Параметр успешно обновлен!</b>\n\n"
+    "<b>Параметр:</b> {name}\n"
+    "<b>Старое значение:</b> {old}\n"
+    "<b>Новое значение:</b> {new}\n\n"
+)
+
+def _orjson_dumps(value: Any) -> str:
+    """Сериализация JSON через orjson (aiogram ожидает str)"""
+    return orjson.dumps(value).decode()
+
+@functools.lru_cache(maxsize=256)
+def _is_config_param(cfg_cls: type, name: str) -> bool:
+    """Проверяет, является ли name параметром конфигурации (результат кэшируется по классу и имени)"""
+    return name.isupper() and name in getattr(cfg_cls, '__slots__', ())
+
+@functools.lru_cache(maxsize=128)
+def _render_param_info(name: str, value: Any, type_name: str) -> str:
+    """Формирует ответ /param_info (кэшируется по имени, значению и типу параметра)"""
+    return _PARAM_INFO_TPL.format(
+        name=name,
+        tname=type_name,
+        tdesc=_TYPE_DESCRIPTIONS.get(type_name, type_name),
+        value=value,
+        examples=_TYPE_EXAMPLES.get(type(value), str(value))
+    )
+
 class InputValidator:
     """Класс для валидации вводимых пользователем значений"""
+    TRUE_VALUES = frozenset({'true', '1', 'yes', 'y', 'on', 'вкл', 'да'})
+    FALSE_VALUES = frozenset({'false', '0', 'no', 'n', 'off', 'выкл', 'нет'})
+
     @staticmethod
     def validate_temperature(text: str) -> float:
         """Валидация температуры ИИ (0.1-1.0)"""
@@ -74,13 +151,10 @@ class InputValidator:
     @staticmethod
     def validate_boolean(text: str) -> bool:
         """Валидация булевых значений"""
-        true_values = ['true', '1', 'yes', 'y', 'on', 'вкл', 'да']
-        false_values = ['false', '0', 'no', 'n', 'off', 'выкл', 'нет']
-        
         clean_text = text.strip().lower()
-        if clean_text in true_values:
+        if clean_text in InputValidator.TRUE_VALUES:
             return True
-        if clean_text in false_values:
+        if clean_text in InputValidator.FALSE_VALUES:
             return False
             
         raise ValueError("Используйте: да/нет, вкл/выкл, true/false")
@@ -133,12 +207,37 @@ class InputValidator:
             
         return times
 
+class TokenBucket:
+    """Ограничитель частоты отправки сообщений (алгоритм token bucket)"""
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate  # Токенов в секунду
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Ожидает появления свободного токена и забирает его"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
 class AsyncTelegramBot:
     def __init__(self, token: str, channel_id: str, config: Config):
         self.token = token
         self.channel_id = channel_id
         self.config = config
-        self.bot = Bot(token=token)
+        if orjson is not None:
+            session = AiohttpSession(json_loads=orjson.loads, json_dumps=_orjson_dumps)
+            self.bot = Bot(token=token, session=session)
+        else:
+            self.bot = Bot(token=token)
         self.dp = Dispatcher()
         self.controller: Optional[BotController] = None
         self.ui = UIBuilder(config)
@@ -146,6 +245,17 @@ class AsyncTelegramBot:
         self.pending_input_timeouts = {}
         self.pending_input_retries = {}
         self.validator = InputValidator()
+        # Схема параметров конфигурации: имя -> (тип, имя типа)
+        self._config_schema: Dict[str, tuple] = {
+            name: (type(value), type(value).__name__)
+            for name in getattr(type(config), '__slots__', ())
+            if name.isupper() and (value := getattr(config, name, None)) is not None
+        }
+        self._chat_queues: Dict[int, asyncio.Queue] = {}  # chat_id: очередь команд
+        self._chat_workers: Dict[int, asyncio.Task] = {}  # chat_id: обработчик очереди
+        self._busy_chats = set()  # chat_id с выполняющейся командой
+        self._send_bucket = TokenBucket(rate=28, capacity=28)  # Лимит Telegram ~30 сообщений/сек
+        self._err_pending: Dict[int, List[str]] = {}  # chat_id: накопленные ошибки
 
         # Запуск фоновой задачи очистки
         self.cleanup_task = asyncio.create_task(self._cleanup_pending_inputs())
@@ -249,8 +359,8 @@ class AsyncTelegramBot:
         self.dp.message.register(self.handle_set, Command("set"))
         self.dp.message.register(self.handle_clear_history, Command("clear_history"))
         self.dp.message.register(self.handle_params_list, Command("params_list"))
-        self.dp.message.register(self.handle_param_info, Command("param_info"))
-        self.dp.message.register(self.handle_set_all, Command("set_all"))
+        self.dp.message.register(self._per_chat(self.handle_param_info), Command("param_info"))
+        self.dp.message.register(self._per_chat(self.handle_set_all), Command("set_all"))
         self.dp.message.register(self.handle_message)
         self.dp.message.register(self.handle_set_schedule, Command("set_schedule"))
         self.dp.message.register(self.handle_set_mode, Command('set_mode'))
@@ -393,6 +503,75 @@ class AsyncTelegramBot:
             logger.error(f"Ошибка обработки callback: {str(e)}", exc_info=True)
             await callback.answer("Ошибка обработки запроса")
 
+    async def _answer(self, message: Message, text: str, **kwargs) -> None:
+        """Отвечает на сообщение с учетом общего лимита отправки"""
+        if message.chat.id in self._err_pending:
+            await self._flush_errors(message.chat.id)
+        await self._send_bucket.acquire()
+        await message.answer(text, **kwargs)
+
+    def _param_schema(self, param_name: str, value: Any) -> tuple:
+        """Возвращает (тип, имя типа) параметра из схемы; параметры, равные None
+        при запуске, добавляются в схему, как только получат значение"""
+        entry = self._config_schema.get(param_name)
+        if entry is None:
+            entry = (type(value), type(value).__name__)
+            if value is not None:
+                self._config_schema[param_name] = entry
+        return entry
+
+    def _queue_error(self, chat_id: int, text: str) -> None:
+        """Накапливает ошибки чата: они уходят одним сообщением, когда очередь
+        команд чата опустеет или перед следующим обычным ответом"""
+        self._err_pending.setdefault(chat_id, []).append(text)
+
+    async def _flush_errors(self, chat_id: int) -> None:
+        """Отправляет накопленные ошибки чата одним сообщением"""
+        errors = self._err_pending.pop(chat_id, None)
+        if not errors:
+            return
+        await self._send_bucket.acquire()
+        await self.send_message(chat_id, "\n\n".join(errors))
+
+    def _per_chat(self, handler):
+        """Оборачивает обработчик: команды одного чата выполняются по порядку,
+        разные чаты обрабатываются параллельно"""
+        async def enqueue(message: Message) -> None:
+            chat_id = message.chat.id
+            queue = self._chat_queues.get(chat_id)
+            if queue is None:
+                queue = self._chat_queues[chat_id] = asyncio.Queue(maxsize=16)
+                self._chat_workers[chat_id] = asyncio.create_task(self._chat_worker(chat_id, queue))
+            # При переполнении очереди ожидаем освобождения места
+            await queue.put((handler, message))
+        return enqueue
+
+    async def _chat_worker(self, chat_id: int, queue: asyncio.Queue) -> None:
+        """Последовательно выполняет команды из очереди чата"""
+        while True:
+            handler, message = await queue.get()
+            self._busy_chats.add(chat_id)
+            try:
+                await handler(message)
+            except Exception as e:
+                logger.error(f"Ошибка обработки команды: {str(e)}", exc_info=True)
+            finally:
+                if queue.empty() and chat_id in self._err_pending:
+                    await self._flush_errors(chat_id)
+                self._busy_chats.discard(chat_id)
+                queue.task_done()
+
+    def _cleanup_idle_chat_queues(self) -> None:
+        """Останавливает обработчики чатов с пустой очередью"""
+        for chat_id, queue in list(self._chat_queues.items()):
+            if queue.empty() and chat_id not in self._busy_chats:
+                self._chat_workers.pop(chat_id).cancel()
+                del self._chat_queues[chat_id]
+
+    async def _save_env_param(self, param: str, value: str) -> None:
+        """Сохраняет параметр в .env, не блокируя цикл событий"""
+        await asyncio.to_thread(self.config.save_to_env_file, param, value)
+
     async def _cleanup_pending_inputs(self):
         """Очистка просроченных ожиданий ввода"""
         while True:
@@ -417,6 +596,8 @@ class AsyncTelegramBot:
                 if user_id in self.pending_input_retries:
                     del self.pending_input_retries[user_id]
             
+            self._cleanup_idle_chat_queues()
+            self.ui.purge_editing_states()
             await asyncio.sleep(60)  # Проверка каждую минуту
 
     async def show_monitoring(self, callback: CallbackQuery) -> None:
@@ -436,7 +617,7 @@ class AsyncTelegramBot:
         """Устанавливает тему оформления"""
         theme_name = callback.data.replace("set_theme_", "")
         if theme_name in self.ui.THEMES:
-            self.ui.user_themes[callback.from_user.id] = self.ui.THEMES[theme_name]
+            self.ui.set_theme(callback.from_user.id, theme_name)
             await callback.answer(f"Тема изменена на {theme_name}")
             await self.show_settings_menu(callback)
         else:
@@ -452,7 +633,7 @@ class AsyncTelegramBot:
             f"• Мин. задержка между постами: {self.config.MIN_DELAY_BETWEEN_POSTS} сек"
         )
         
-        keyboard = await self.ui.back_to_settings()
+        keyboard = self.ui.back_to_settings()
         await callback.message.edit_text(
             text=text,
             reply_markup=keyboard,
@@ -497,13 +678,13 @@ class AsyncTelegramBot:
     
     async def edit_general_settings(self, callback: CallbackQuery):
         """Вход в режим редактирования"""
-        await self.ui.start_general_edit(callback.from_user.id)
+        self.ui.start_general_edit(callback.from_user.id)
         await self.show_general_settings(callback, edit_mode=True)
     
     async def edit_general_param(self, callback: CallbackQuery):
         """Обработка выбора параметра"""
         param = callback.data.replace("edit_general_", "")
-        keyboard = await self.ui.general_param_selector(callback.from_user.id, param)
+        keyboard = self.ui.general_param_selector(callback.from_user.id, param)
         await callback.message.edit_text(f"Выберите значение для {param}:", reply_markup=keyboard)
     
     async def set_general_param(self, callback: CallbackQuery) -> None:
@@ -561,7 +742,7 @@ class AsyncTelegramBot:
             value = float(value_str) if "." in value_str else int(value_str)
             
             # Обновляем временное значение в UI
-            await self.ui.update_general_setting(
+            self.ui.update_general_setting(
                 callback.from_user.id,
                 param,
                 value
@@ -577,7 +758,7 @@ class AsyncTelegramBot:
     async def save_general_settings(self, callback: CallbackQuery):
         """Сохранение изменений"""
         try:
-            changes = await self.ui.save_general_settings(callback.from_user.id)
+            changes = self.ui.save_general_settings(callback.from_user.id)
             if not changes:
                 await callback.answer("Настройки не изменены")
                 return
@@ -785,7 +966,7 @@ class AsyncTelegramBot:
             
             # Сбрасываем состояние редактирования в UI
             if hasattr(self.ui, 'cancel_general_edit'):
-                await self.ui.cancel_general_edit(user_id)
+                self.ui.cancel_general_edit(user_id)
             
             # Очищаем состояние ожидания ввода
             if user_id in self.pending_input:
@@ -841,7 +1022,7 @@ class AsyncTelegramBot:
 
     async def edit_ai_settings(self, callback: CallbackQuery) -> None:
         """Переходит в режим редактирования настроек AI"""
-        await self.ui.start_ai_edit(callback.from_user.id)
+        self.ui.start_ai_edit(callback.from_user.id)
         await self.show_ai_settings(callback, edit_mode=True)
         await callback.answer()
 
@@ -851,13 +1032,13 @@ class AsyncTelegramBot:
         user_id = callback.from_user.id
         
         if param_type == "model":
-            keyboard = await self.ui.ai_model_selector(user_id)
+            keyboard = self.ui.ai_model_selector(user_id)
             text = "Выберите модель:"
         elif param_type == "temp":
-            keyboard = await self.ui.ai_temp_selector(user_id)
+            keyboard = self.ui.ai_temp_selector(user_id)
             text = "Выберите температуру (0.1-1.0):"
         elif param_type == "tokens":
-            keyboard = await self.ui.ai_tokens_selector(user_id)
+            keyboard = self.ui.ai_tokens_selector(user_id)
             text = "Выберите максимальное количество токенов:"
         else:
             await callback.answer("Неизвестный параметр")
@@ -881,20 +1062,20 @@ class AsyncTelegramBot:
     async def set_ai_model(self, callback: CallbackQuery) -> None:
         """Устанавливает выбранную модель"""
         model = callback.data.split(":")[1]
-        await self.ui.update_ai_setting(callback.from_user.id, "model", model)
+        self.ui.update_ai_setting(callback.from_user.id, "model", model)
         await self.show_ai_settings(callback, edit_mode=True)
         await callback.answer(f"Модель изменена на {model}")
 
     async def toggle_ai_enabled(self, callback: CallbackQuery) -> None:
         """Переключает состояние ИИ"""
-        await self.ui.update_ai_setting(callback.from_user.id, "enabled", None)
+        self.ui.update_ai_setting(callback.from_user.id, "enabled", None)
         await self.show_ai_settings(callback, edit_mode=True)
         await callback.answer("Состояние ИИ изменено")
 
     async def set_ai_temp(self, callback: CallbackQuery) -> None:
         """Устанавливает температуру из предустановленных значений"""
         temp = float(callback.data.split(":")[1])
-        await self.ui.update_ai_setting(callback.from_user.id, "temperature", temp)
+        self.ui.update_ai_setting(callback.from_user.id, "temperature", temp)
         await self.show_ai_settings(callback, edit_mode=True)
         await callback.answer(f"Температура изменена на {temp}")
 
@@ -924,7 +1105,7 @@ class AsyncTelegramBot:
     async def set_ai_tokens(self, callback: CallbackQuery) -> None:
         """Устанавливает токены из предустановленных значений"""
         tokens = int(callback.data.split(":")[1])
-        await self.ui.update_ai_setting(callback.from_user.id, "max_tokens", tokens)
+        self.ui.update_ai_setting(callback.from_user.id, "max_tokens", tokens)
         await self.show_ai_settings(callback, edit_mode=True)
         await callback.answer(f"Макс. токенов изменено на {tokens}")
 
@@ -954,7 +1135,7 @@ class AsyncTelegramBot:
     async def save_ai_settings(self, callback: CallbackQuery) -> None:
         """Сохраняет изменения настроек AI"""
         try:
-            changes = await self.ui.save_ai_settings(callback.from_user.id)
+            changes = self.ui.save_ai_settings(callback.from_user.id)
             
             if not changes:
                 await callback.answer("Настройки не изменены")
@@ -983,7 +1164,7 @@ class AsyncTelegramBot:
 
     async def cancel_ai_edit(self, callback: CallbackQuery) -> None:
         """Отменяет редактирование настроек AI"""
-        await self.ui.cancel_ai_edit(callback.from_user.id)
+        self.ui.cancel_ai_edit(callback.from_user.id)
         await self.show_ai_settings(callback)
         await callback.answer("Редактирование отменено")
 
@@ -1000,7 +1181,7 @@ class AsyncTelegramBot:
     
     async def start_rss_add(self, callback: CallbackQuery):
         """Начало добавления RSS"""
-        keyboard = await self.ui.rss_add_dialog()
+        keyboard = self.ui.rss_add_dialog()
         await callback.message.edit_text(
             "Введите URL новой RSS-ленты:",
             reply_markup=keyboard
@@ -1010,7 +1191,7 @@ class AsyncTelegramBot:
     async def start_rss_remove(self, callback: CallbackQuery):
         """Начало удаления RSS"""
         feeds = self.controller.get_rss_status()
-        keyboard = await self.ui.rss_remove_selector(feeds)
+        keyboard = self.ui.rss_remove_selector(feeds)
         await callback.message.edit_text(
             "Выберите ленту для удаления:",
             reply_markup=keyboard
@@ -1152,13 +1333,13 @@ class AsyncTelegramBot:
                     elif param_type == 'ai':
                         if param == 'temperature':
                             value = self.validator.validate_temperature(text)
-                            await self.ui.update_ai_setting(user_id, "temperature", value)
+                            self.ui.update_ai_setting(user_id, "temperature", value)
                             await message.answer(f"✅ Установлено: {param} = {value}")
                             await self.show_ai_settings(message, edit_mode=True)
                             
                         elif param == 'max_tokens':
                             value = self.validator.validate_tokens(text)
-                            await self.ui.update_ai_setting(user_id, "max_tokens", value)
+                            self.ui.update_ai_setting(user_id, "max_tokens", value)
                             await message.answer(f"✅ Установлено: {param} = {value}")
                             await self.show_ai_settings(message, edit_mode=True)
                             
@@ -1184,10 +1365,10 @@ class AsyncTelegramBot:
                         
                         # Обновление параметра
                         if param_type == 'ai':
-                            await self.ui.update_ai_setting(user_id, param, value)
+                            self.ui.update_ai_setting(user_id, param, value)
                             await self.show_ai_settings(message, edit_mode=True)
                         elif param_type == 'general':
-                            await self.ui.update_general_setting(user_id, param, value)
+                            self.ui.update_general_setting(user_id, param, value)
                             await self.show_general_settings(message, edit_mode=True)
                             
                         await message.answer(f"✅ Установлено: {param} = {value}")
@@ -1245,8 +1426,8 @@ class AsyncTelegramBot:
                 try:
                     self.config.RSS_URLS.append(url)
                     self.config.RSS_ACTIVE.append(True)
-                    self.config.save_to_env_file("RSS_URLS", json.dumps(self.config.RSS_URLS))
-                    self.config.save_to_env_file("RSS_ACTIVE", json.dumps(self.config.RSS_ACTIVE))
+                    await self._save_env_param("RSS_URLS", json.dumps(self.config.RSS_URLS))
+                    await self._save_env_param("RSS_ACTIVE", json.dumps(self.config.RSS_ACTIVE))
                     
                     if self.controller:
                         self.controller.update_rss_state(self.config.RSS_URLS, self.config.RSS_ACTIVE)
@@ -1300,7 +1481,7 @@ class AsyncTelegramBot:
             "Функция в разработке"
         )
         
-        keyboard = await self.ui.back_to_settings()
+        keyboard = self.ui.back_to_settings()
         await callback.message.edit_text(
             text=text,
             reply_markup=keyboard,
@@ -1321,7 +1502,7 @@ class AsyncTelegramBot:
     
     async def send_main_menu(self, user_id: int, chat_id: int) -> None:
         """Отправляет главное меню"""
-        keyboard = await self.ui.main_menu(user_id)
+        keyboard = self.ui.main_menu(user_id)
         if not keyboard:
             return  # Уже обработано в ui
         
@@ -1335,7 +1516,7 @@ class AsyncTelegramBot:
     async def show_main_menu(self, callback: CallbackQuery) -> None:
         """Показывает главное меню, редактируя текущее сообщение"""
         user_id = callback.from_user.id
-        keyboard = await self.ui.main_menu(user_id)
+        keyboard = self.ui.main_menu(user_id)
         if not keyboard:
             return
         
@@ -1385,7 +1566,7 @@ class AsyncTelegramBot:
     
     async def show_settings_menu(self, callback: CallbackQuery) -> None:
         """Показывает меню настроек"""
-        keyboard = await self.ui.settings_menu(callback.from_user.id)
+        keyboard = self.ui.settings_menu(callback.from_user.id)
         
         try:
             await callback.message.edit_text(
@@ -1421,7 +1602,7 @@ class AsyncTelegramBot:
     
     async def show_theme_selector(self, callback: CallbackQuery) -> None:
         """Показывает выбор тем оформления"""
-        keyboard = await self.ui.theme_selector(callback.from_user.id)
+        keyboard = self.ui.theme_selector(callback.from_user.id)
         
         try:
             await callback.message.edit_text(
@@ -1511,10 +1692,10 @@ class AsyncTelegramBot:
             lines = ["📡 <b>Статус RSS-лент</b>\n"]
             
             for i, feed in enumerate(feeds, 1):
-                status_icon = '🟢' if feed.get('active', True) else '🔴'
-                error_icon = f" | ❗️ {feed.get('error_count', 0)}" if feed.get('error_count', 0) > 0 else ""
-                last_check = f" | 📅 {feed.get('last_check', 'никогда')}" if feed.get('last_check') else ""
-                lines.append(f"{i}. {status_icon} {feed['url'][:50]}...{error_icon}{last_check}")
+                status_icon = self.ui.STATUS_ICONS[feed.active]
+                error_icon = f" | ❗️ {feed.error_count}" if feed.error_count > 0 else ""
+                last_check = f" | 📅 {feed.last_check}" if feed.last_check else ""
+                lines.append(f"{i}. {status_icon} {feed.url[:50]}...{error_icon}{last_check}")
             
             # Исправлено создание клавиатуры
             keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -1722,7 +1903,7 @@ class AsyncTelegramBot:
         
         try:
             if param_type is bool:
-                converted_value = value.lower() in ['true', '1', 'yes', 'on']
+                converted_value = value.strip().lower() in _TRUTHY
             else:
                 converted_value = param_type(value)
             
@@ -1731,7 +1912,7 @@ class AsyncTelegramBot:
             
             setattr(self.config, param, converted_value)
             await message.answer(f"✅ Параметр {param} обновлен на {value}")
-            self.config.save_to_env_file(param, str(converted_value))
+            await self._save_env_param(param, str(converted_value))
         except (TypeError, ValueError) as e:
             await message.answer(f"❌ Ошибка: {str(e)}")
 
@@ -2060,73 +2241,50 @@ class AsyncTelegramBot:
         if not await self.is_owner(message):
             return
             
-        args = message.text.split()
+        args = message.text.split(None, 2)
         if len(args) < 2:
-            await message.answer("❌ Укажите имя параметра")
+            await self._answer(message, "❌ Укажите имя параметра")
             return
             
         param_name = args[1].upper()
         
-        if not hasattr(self.config, param_name):
-            await message.answer(f"❌ Параметр {param_name} не существует")
+        if not _is_config_param(type(self.config), param_name):
+            await self._answer(message, f"❌ Параметр {param_name} не существует")
             return
             
         value = getattr(self.config, param_name)
         value_type = type(value).__name__
         
-        type_description = {
-            'int': 'целое число',
-            'float': 'число с плавающей точкой',
-            'bool': 'логическое значение (true/false)',
-            'str': 'строка',
-            'list': 'список значений (через запятую)',
-            'tuple': 'кортеж чисел (через запятую)'
-        }.get(value_type, value_type)
-        
-        examples = {
-            int: "42",
-            float: "3.14",
-            bool: "true или false",
-            str: "любая строка",
-            list: "item1, item2, item3",
-            tuple: "255, 255, 255"
-        }.get(type(value), str(value))
-        
-        response = (
-            f"ℹ️ <b>Информация о параметре:</b>\n\n"
-            f"<b>Имя:</b> {param_name}\n"
-            f"<b>Тип:</b> {value_type} ({type_description})\n"
-            f"<b>Текущее значение:</b> {value}\n\n"
-            f"<b>Примеры значений:</b>\n"
-            f"{examples}\n\n"
-            f"<b>Изменить командой:</b>\n"
-            f"<code>/set_all {param_name} [новое_значение]</code>"
-        )
+        try:
+            response = _render_param_info(param_name, value, value_type)
+        except TypeError:
+            # Нехэшируемые значения (списки) рендерятся без кэша
+            response = _render_param_info.__wrapped__(param_name, value, value_type)
         
-        await message.answer(response, parse_mode="HTML")
+        await self._answer(message, response, parse_mode="HTML")
 
     async def handle_set_all(self, message: Message) -> None:
         if not await self.is_owner(message):
             return
             
-        args = message.text.split()
-        if len(args) < 3:
-            await message.answer("❌ Используйте: /set_all [параметр] [значение]")
+        parts = message.text.split(None, 2)
+        if len(parts) < 3:
+            await self._answer(message, "❌ Используйте: /set_all [параметр] [значение]")
             return
             
-        param_name = args[1].upper()
-        new_value_str = " ".join(args[2:])
+        _, param_raw, new_value_str = parts
+        param_name = param_raw.upper()
         
-        if not hasattr(self.config, param_name):
-            await message.answer(f"❌ Параметр {param_name} не существует")
+        if not _is_config_param(type(self.config), param_name):
+            await self._answer(message, f"❌ Параметр {param_name} не существует")
             return
             
         current_value = getattr(self.config, param_name)
-        value_type = type(current_value)
+        value_type, type_name = self._param_schema(param_name, current_value)
         
         try:
             if value_type is bool:
-                converted_value = new_value_str.lower() in ['true', '1', 'yes', 'y', 't', 'on']
+                converted_value = new_value_str.strip().lower() in _TRUTHY
             elif value_type is int:
                 converted_value = int(new_value_str)
             elif value_type is float:
@@ -2134,37 +2292,54 @@ class AsyncTelegramBot:
             elif value_type is list:
                 converted_value = [item.strip() for item in new_value_str.split(',')]
             elif value_type is tuple:
-                converted_value = tuple(map(int, new_value_str.split(',')))
+                if not _INT_TUPLE_RE.fullmatch(new_value_str):
+                    raise ValueError("Ожидаются целые числа через запятую")
+                converted_value = tuple(int(num) for num in _INT_RE.findall(new_value_str))
+                if len(converted_value) != len(current_value):
+                    raise ValueError(f"Ожидается {len(current_value)} чисел через запятую")
             elif value_type is str:
                 converted_value = new_value_str
             else:
                 converted_value = value_type(new_value_str)
             
+            if converted_value == current_value:
+                await self._answer(message, "ℹ️ Значение не изменилось")
+                return
+            
             setattr(self.config, param_name, converted_value)
-            self.config.save_to_env_file(param_name, str(converted_value))
+            new_value_out = str(converted_value)
+            await self._save_env_param(param_name, new_value_out)
             
-            response = (
-                f"✅ <b>Параметр успешно обновлен!</b>\n\n"
-                f"<b>Параметр:</b> {param_name}\n"
-                f"<b>Старое значение:</b> {current_value}\n"
-                f"<b>Новое значение:</b> {converted_value}\n\n"
+            response = _SET_ALL_OK_TPL.format(
+                name=param_name,
+                old=current_value,
+                new=new_value_out
             )
             
-            critical_params = ['TOKEN', 'CHANNEL_ID', 'OWNER_ID', 'YANDEX_API_KEY']
-            if param_name in critical_params:
+            if param_name in _CRITICAL_PARAMS:
                 response += "⚠️ <i>Для применения изменений может потребоваться перезагрузка бота</i>"
             
-            await message.answer(response, parse_mode="HTML")
+            await self._answer(message, response, parse_mode="HTML")
         except (TypeError, ValueError) as e:
-            await message.answer(
+            self._queue_error(
+                message.chat.id,
                 f"❌ <b>Ошибка преобразования значения:</b>\n"
                 f"Параметр: {param_name}\n"
-                f"Требуемый тип: {value_type.__name__}\n"
-                f"Ошибка: {str(e)}",
-                parse_mode="HTML"
+                f"Требуемый тип: {type_name}\n"
+                f"Ошибка: {str(e)}"
             )
 
     async def close(self) -> None:
-        if hasattr(self, 'cleanup_task'):
-            self.cleanup_task.cancel()
+        task = getattr(self, 'cleanup_task', None)
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        for worker in self._chat_workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._chat_workers.values(), return_exceptions=True)
+        self._chat_workers.clear()
+        self._chat_queues.clear()
+        self._err_pending.clear()
+        self.ui.close()
         await self.bot.session.close()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Any, Optional, Dict, List
+from typing import TYPE_CHECKING, Any, Optional, Dict, List
 from aiogram.types import (
     InlineKeyboardMarkup, 
     InlineKeyboardButton,
@@ -7,18 +7,237 @@ from aiogram.types import (
     FSInputFile
 )
 from aiogram.types import BufferedInputFile
-from aiogram.utils.keyboard import InlineKeyboardBuilder
 from config import Config
 import asyncio
+import functools
 import os
 import logging
-import matplotlib.pyplot as plt
-import numpy as np
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
+from collections import OrderedDict
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger('VisualInterface')
 
+# Параметры графика активности по часам (пиксели)
+_CHART_WIDTH = 960
+_CHART_HEIGHT = 540
+_CHART_MARGIN = 48
+_CHART_BAR_COLOR = (76, 175, 80)   # #4CAF50
+_CHART_GRID_COLOR = (224, 224, 224)
+_CHART_AXIS_COLOR = (0, 0, 0)
+_GLYPH_SCALE = 3
+# Ключи почасовой статистики hour_0..hour_23
+_HOUR_KEYS = tuple(f'hour_{h}' for h in range(24))
+
+# Ограничения для незавершенных сессий редактирования настроек
+_MAX_EDITORS = 256
+_EDIT_STATE_TTL = 30 * 60  # секунды
+
+# Максимум закэшированных PNG превью изображения
+_PREVIEW_CACHE_SIZE = 32
+
+# Пресеты значений в меню выбора и их подписи (обычная, отмеченная текущим значением)
+_GENERAL_PRESETS = {
+    'check_interval': (60, 300, 600, 1800),
+    'max_posts': (1, 3, 5, 10),
+    'posts_per_hour': (10, 20, 30, 50),
+    'min_delay': (10, 30, 60, 120)
+}
+_AI_MODELS = ('yandexgpt-lite', 'yandexgpt-pro')
+_AI_TEMP_PRESETS = (0.1, 0.3, 0.5, 0.7, 0.9)
+_AI_TOKEN_PRESETS = (1000, 2000, 3000, 4000, 5000)
+_PRESET_LABELS = {
+    value: (f"{value}", f"✅ {value}")
+    for presets in (*_GENERAL_PRESETS.values(), _AI_MODELS, _AI_TEMP_PRESETS, _AI_TOKEN_PRESETS)
+    for value in presets
+}
+
+# Подписи кнопок, зависящие от темы: ключ -> (цвет темы, текст)
+_THEME_LABELS = {
+    'main': ('primary', 'Главная'),
+    'monitoring': ('text', 'Мониторинг'),
+    'settings': ('text', 'Настройки'),
+    'stats': ('text', 'Статистика'),
+    'rss_list': ('text', 'RSS Ленты'),
+    'start_bot': ('success', 'Запустить'),
+    'stop_bot': ('warning', 'Остановить'),
+    'settings_general': ('text', 'Основные'),
+    'settings_images': ('text', 'Изображения'),
+    'settings_ai': ('text', 'AI'),
+    'settings_rss': ('text', 'RSS'),
+    'settings_notify': ('text', 'Оповещения'),
+    'main_menu': ('primary', 'Назад'),
+    'edit': ('primary', 'Редактировать'),
+    'back': ('text', 'Назад'),
+}
+
+# Растровые цифры 3x5 для подписей осей (вместо отрисовки шрифтом)
+_DIGIT_BITMAPS = {
+    '0': ('111', '101', '101', '101', '111'),
+    '1': ('010', '110', '010', '010', '111'),
+    '2': ('111', '001', '111', '100', '111'),
+    '3': ('111', '001', '111', '001', '111'),
+    '4': ('101', '101', '111', '001', '001'),
+    '5': ('111', '100', '111', '001', '111'),
+    '6': ('111', '100', '111', '101', '111'),
+    '7': ('111', '001', '010', '010', '010'),
+    '8': ('111', '101', '111', '101', '111'),
+    '9': ('111', '101', '111', '001', '111'),
+}
+_GLYPH_HEIGHT = 5 * _GLYPH_SCALE
+_GLYPH_WIDTH = 3 * _GLYPH_SCALE
+_GLYPH_SPACING = _GLYPH_SCALE
+_LABEL_PADDING = 6  # Отступ подписи максимума от оси Y
+
+
+@functools.lru_cache(maxsize=1)
+def _digit_atlas() -> Dict[str, 'np.ndarray']:
+    """Маски цифр в масштабе графика (строятся при первом использовании)"""
+    import numpy as np
+    return {
+        digit: np.array([[c == '1' for c in row] for row in rows], dtype=bool)
+            .repeat(_GLYPH_SCALE, axis=0).repeat(_GLYPH_SCALE, axis=1)
+        for digit, rows in _DIGIT_BITMAPS.items()
+    }
+
+
+def _number_width(text: str) -> int:
+    """Ширина числа в пикселях при отрисовке растровыми цифрами"""
+    return len(text) * (_GLYPH_WIDTH + _GLYPH_SPACING) - _GLYPH_SPACING
+
+
+def _draw_number(img: 'np.ndarray', text: str, x_center: int, y_top: int) -> None:
+    """Рисует число растровыми цифрами, центрируя его по x_center"""
+    atlas = _digit_atlas()
+    x = max(0, x_center - _number_width(text) // 2)
+    for char in text:
+        glyph = atlas[char]
+        img[y_top:y_top + _GLYPH_HEIGHT, x:x + _GLYPH_WIDTH][glyph] = _CHART_AXIS_COLOR
+        x += _GLYPH_WIDTH + _GLYPH_SPACING
+
+@functools.lru_cache(maxsize=1)
+def _chart_background() -> 'np.ndarray':
+    """Статичный слой графика: сетка, оси и подписи часов (строится один раз)"""
+    import numpy as np
+    img = np.full((_CHART_HEIGHT, _CHART_WIDTH, 3), 255, np.uint8)
+    bottom = _CHART_HEIGHT - _CHART_MARGIN
+    left, right = _CHART_MARGIN, _CHART_WIDTH - _CHART_MARGIN
+    plot_h = bottom - _CHART_MARGIN
+    bar_w = (right - left) // len(_HOUR_KEYS)
+    
+    # Сетка по оси Y: 25%, 50%, 75%, 100%
+    for step in range(1, 5):
+        img[bottom - plot_h * step // 4, left:right] = _CHART_GRID_COLOR
+    
+    for hour in range(len(_HOUR_KEYS)):
+        _draw_number(img, str(hour), left + hour * bar_w + bar_w // 2, bottom + 8)
+    
+    # Оси
+    img[bottom, left:right] = _CHART_AXIS_COLOR
+    img[_CHART_MARGIN:bottom + 1, left] = _CHART_AXIS_COLOR
+    img.flags.writeable = False
+    return img
+
+
+def _rasterize_bars(img: 'np.ndarray', posts: List[int]) -> None:
+    """Копирует статичный слой в массив RGB и рисует поверх столбцы и максимум"""
+    import numpy as np
+    np.copyto(img, _chart_background())
+    bottom = _CHART_HEIGHT - _CHART_MARGIN
+    left, right = _CHART_MARGIN, _CHART_WIDTH - _CHART_MARGIN
+    plot_h = bottom - _CHART_MARGIN
+    bar_w = (right - left) // len(posts)
+    pmax = max(posts)
+    scale = plot_h / (pmax or 1)
+    
+    # Каждый столбец - одна срезовая запись NumPy, без попиксельных циклов
+    for hour, count in enumerate(posts):
+        if count > 0:
+            x0 = left + hour * bar_w
+            img[bottom - int(count * scale):bottom, x0 + 2:x0 + bar_w - 2] = _CHART_BAR_COLOR
+    
+    # Максимум выравнивается по правому краю у оси Y; если не помещается слева, подписывается над ней
+    label = str(pmax)
+    width = _number_width(label)
+    if width <= left - _LABEL_PADDING:
+        _draw_number(img, label, left - _LABEL_PADDING - width // 2, _CHART_MARGIN - _GLYPH_HEIGHT // 2)
+    else:
+        _draw_number(img, label, left + _LABEL_PADDING + width // 2, _CHART_MARGIN - _GLYPH_HEIGHT - _LABEL_PADDING)
+
+
+# Буфер кодирования PNG на каждый поток отрисовки
+_png_local = threading.local()
+
+
+def _encode_png(image, **params) -> bytes:
+    """Кодирует изображение в PNG через переиспользуемый буфер текущего потока"""
+    buf = getattr(_png_local, 'buf', None)
+    if buf is None:
+        buf = _png_local.buf = BytesIO()
+    buf.seek(0)
+    buf.truncate()
+    image.save(buf, format='PNG', **params)
+    return buf.getvalue()
+
+
+@functools.lru_cache(maxsize=8)
+def _load_font(path: str, size: int):
+    """Загружает шрифт один раз на (путь, размер); при отсутствии файла - шрифт по умолчанию"""
+    from PIL import ImageFont
+    if os.path.exists(path):
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=512)
+def _truncate_url(url: str) -> str:
+    """Обрезает длинные URL для отображения"""
+    if len(url) > 50:
+        return url[:25] + "..." + url[-25:]
+    return url
+
+
+def _chunk(buttons: List[InlineKeyboardButton], widths: tuple) -> List[List[InlineKeyboardButton]]:
+    """Разбивает кнопки на ряды заданной ширины (последняя ширина повторяется, как в adjust)"""
+    rows = []
+    start = 0
+    i = 0
+    while start < len(buttons):
+        width = widths[min(i, len(widths) - 1)]
+        rows.append(buttons[start:start + width])
+        start += width
+        i += 1
+    return rows
+
+class _EditingStates(OrderedDict):
+    """Временные настройки пользователей с ограничением количества и времени жизни"""
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+        self.started: Dict[int, float] = {}  # user_id: время начала редактирования
+    
+    def start(self, user_id: int, settings: Dict[str, Any]) -> None:
+        """Начинает сессию редактирования, вытесняя самые старые при переполнении"""
+        self[user_id] = settings
+        self.move_to_end(user_id)
+        self.started[user_id] = time.monotonic()
+        while len(self) > self.max_size:
+            old_user_id, _ = self.popitem(last=False)
+            self.started.pop(old_user_id, None)
+    
+    def purge(self, max_age: float) -> None:
+        """Удаляет сессии старше max_age секунд"""
+        deadline = time.monotonic() - max_age
+        for user_id, started in list(self.started.items()):
+            if started < deadline:
+                self.pop(user_id, None)
+                del self.started[user_id]
+
 class UIBuilder:
     THEMES = {
         'default': {
@@ -44,60 +263,93 @@ class UIBuilder:
         }
     }
     
-    # Новое поле для хранения временных настроек
-    user_editing_states: Dict[int, Dict[str, Any]] = {}  # Для AI настроек
-    user_general_editing_states: Dict[int, Dict[str, Any]] = {}  # Для основных настроек
+    STATUS_ICONS = {True: '🟢', False: '🔴'}
+    
+    # Готовые строки прогресс-баров для 0..10 заполненных делений
+    _BAR_CACHE = ["[" + "■" * i + "□" * (10 - i) + "]" for i in range(11)]
+    _PROCESS_BARS = ["⬛" * i + "⬜" * (10 - i) for i in range(11)]
+    
 
     def __init__(self, config: Config):
         self.config = config
-        self.user_themes = {}
+        self.user_themes: Dict[int, str] = {}  # user_id: название темы
+        
+        # Временные настройки на время редактирования
+        self.user_editing_states = _EditingStates(_MAX_EDITORS)  # Для AI настроек
+        self.user_general_editing_states = _EditingStates(_MAX_EDITORS)  # Для основных настроек
+        
+        # Переиспользуемый холст графика статистики
+        self._chart_canvas = None  # Создается при первой отрисовке
+        self._chart_lock = threading.Lock()
+        # Потоки для отрисовки PNG вне цикла событий
+        self._render_pool = ThreadPoolExecutor(max_workers=2)
+        self._preview_cache: OrderedDict = OrderedDict()  # настройки изображения: PNG превью (LRU)
+        
+        # Статические клавиатуры строятся один раз: (меню, тема) -> клавиатура
+        self._menu_cache: Dict[tuple, InlineKeyboardMarkup] = {}
+        for theme_name, theme in self.THEMES.items():
+            self._menu_cache[('main', theme_name)] = self._build_main_menu(theme)
+            self._menu_cache[('settings', theme_name)] = self._build_settings_menu(theme)
+        self._menu_cache[('theme_selector', None)] = self._build_theme_selector()
+        self._menu_cache[('back', None)] = self._build_back_button()
+        self._menu_cache[('rss_add', None)] = self._build_rss_add_dialog()
+    
+    def purge_editing_states(self) -> None:
+        """Удаляет брошенные сессии редактирования настроек"""
+        self.user_editing_states.purge(_EDIT_STATE_TTL)
+        self.user_general_editing_states.purge(_EDIT_STATE_TTL)
+    
+    def close(self) -> None:
+        """Останавливает потоки отрисовки, отменяя невыполненные задачи"""
+        self._render_pool.shutdown(wait=False, cancel_futures=True)
+    
+    def get_theme_name(self, user_id: int) -> str:
+        return self.user_themes.get(user_id, 'default')
     
     def get_theme(self, user_id: int) -> dict:
-        return self.user_themes.get(user_id, self.THEMES['default'])
+        return self.THEMES[self.get_theme_name(user_id)]
     
-    async def main_menu(self, user_id: int) -> Optional[InlineKeyboardMarkup]:
-        """Показывает главное меню только владельцу"""
-        # Проверка прав доступа
-        if user_id != self.config.OWNER_ID:
-            return None
-        
-        theme = self.get_theme(user_id)
-        
+    def set_theme(self, user_id: int, theme_name: str) -> None:
+        """Устанавливает тему пользователя (клавиатуры тем уже построены)"""
+        self.user_themes[user_id] = theme_name
+    
+    def _build_main_menu(self, theme: dict) -> InlineKeyboardMarkup:
+        """Строит главное меню для темы"""
         # Основные кнопки меню
         buttons = [
             [
                 InlineKeyboardButton(
-                    text=f"{theme['primary']} Главная",
+                    text=theme['labels']['main'],
                     callback_data="main"
                 )
             ],
             [
                 InlineKeyboardButton(
-                    text=f"{theme['text']} Мониторинг",
+                    text=theme['labels']['monitoring'],
                     callback_data="monitoring"
                 ),
                 InlineKeyboardButton(
-                    text=f"{theme['text']} Настройки",
+                    text=theme['labels']['settings'],
                     callback_data="settings"
                 )
             ],
             [
                 InlineKeyboardButton(
-                    text=f"{theme['text']} Статистика",
+                    text=theme['labels']['stats'],
                     callback_data="stats"
                 ),
                 InlineKeyboardButton(
-                    text=f"{theme['text']} RSS Ленты",
+                    text=theme['labels']['rss_list'],
                     callback_data="rss_list"
                 )
             ],
             [
                 InlineKeyboardButton(
-                    text=f"{theme['success']} Запустить",
+                    text=theme['labels']['start_bot'],
                     callback_data="start_bot"
                 ),
                 InlineKeyboardButton(
-                    text=f"{theme['warning']} Остановить",
+                    text=theme['labels']['stop_bot'],
                     callback_data="stop_bot"
                 )
             ],
@@ -111,39 +363,84 @@ class UIBuilder:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
-    async def back_to_settings(self) -> InlineKeyboardMarkup:
-        builder = InlineKeyboardBuilder()
-        builder.button(
-            text="◀️ Назад",
-            callback_data="settings"
-        )
-        return builder.as_markup()
+    def _build_settings_menu(self, theme: dict) -> InlineKeyboardMarkup:
+        """Строит меню настроек для темы"""
+        buttons = [
+            [
+                InlineKeyboardButton(text=theme['labels']['settings_general'], callback_data="settings_general"),
+                InlineKeyboardButton(text=theme['labels']['settings_images'], callback_data="settings_images")
+            ],
+            [
+                InlineKeyboardButton(text=theme['labels']['settings_ai'], callback_data="settings_ai"),
+                InlineKeyboardButton(text=theme['labels']['settings_rss'], callback_data="settings_rss")
+            ],
+            [
+                InlineKeyboardButton(text=theme['labels']['settings_notify'], callback_data="settings_notify"),
+                InlineKeyboardButton(text=theme['labels']['main_menu'], callback_data="main_menu")
+            ]
+        ]
+        
+        return InlineKeyboardMarkup(inline_keyboard=buttons)
+    
+    def _build_theme_selector(self) -> InlineKeyboardMarkup:
+        """Строит клавиатуру выбора темы"""
+        buttons = [
+            InlineKeyboardButton(
+                text=self.THEMES[theme_name]['labels']['selector'],
+                callback_data=f"set_theme_{theme_name}"
+            )
+            for theme_name in self.THEMES
+        ]
+        buttons.append(InlineKeyboardButton(text="◀️ Назад", callback_data="settings"))
+        
+        return InlineKeyboardMarkup(inline_keyboard=_chunk(buttons, (2, 1)))
+    
+    def _build_back_button(self) -> InlineKeyboardMarkup:
+        """Строит кнопку 'Назад' в меню настроек"""
+        return InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="◀️ Назад", callback_data="settings")]
+        ])
     
-    async def back_button(self) -> InlineKeyboardMarkup:
+    def _build_rss_add_dialog(self) -> InlineKeyboardMarkup:
+        """Строит клавиатуру диалога добавления RSS"""
+        return InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="❌ Отмена", callback_data="rss_settings")]
+        ])
+    
+    def main_menu(self, user_id: int) -> Optional[InlineKeyboardMarkup]:
+        """Показывает главное меню только владельцу"""
+        # Проверка прав доступа
+        if user_id != self.config.OWNER_ID:
+            return None
+        
+        return self._menu_cache[('main', self.get_theme_name(user_id))]
+    
+    def back_to_settings(self) -> InlineKeyboardMarkup:
+        return self._menu_cache[('back', None)]
+    
+    def back_button(self) -> InlineKeyboardMarkup:
         """Кнопка 'Назад' для меню настроек"""
-        builder = InlineKeyboardBuilder()
-        builder.button(
-            text="◀️ Назад",
-            callback_data="settings"
-        )
-        return builder.as_markup()
+        return self._menu_cache[('back', None)]
+
+    def _render_stats_png(self, posts: List[int]) -> bytes:
+        """Рисует столбчатую диаграмму активности по часам напрямую в массив и кодирует в PNG"""
+        import numpy as np
+        from PIL import Image
+        
+        # Холст общий для всех вызовов: блокировка защищает его от одновременной отрисовки
+        with self._chart_lock:
+            if self._chart_canvas is None:
+                self._chart_canvas = np.empty((_CHART_HEIGHT, _CHART_WIDTH, 3), np.uint8)
+            img = self._chart_canvas
+            _rasterize_bars(img, posts)
+        
+            return _encode_png(Image.fromarray(img), optimize=False, compress_level=1)
 
     async def stats_visualization(self, stats: dict) -> tuple:
         """Генерирует визуализацию статистики"""
         try:
-            # График активности по часам
-            plt.figure(figsize=(10, 6))
-            
-            # Данные для графика (пример)
-            hours = list(range(24))
-            posts = [stats.get(f'hour_{h}', 0) for h in hours]
-            
-            plt.bar(hours, posts, color='#4CAF50')
-            plt.title('Активность по часам')
-            plt.xlabel('Часы')
-            plt.ylabel('Посты')
-            plt.xticks(hours)
-            plt.grid(axis='y', alpha=0.5)
+            # Данные для графика активности по часам
+            posts = [stats.get(key, 0) for key in _HOUR_KEYS]
             
             summary = (
                 "📊 <b>Статистика производительности</b>\n\n"
@@ -155,49 +452,17 @@ class UIBuilder:
                 f"▸ Аптайм: <b>{stats.get('uptime', '0:00')}</b>"
             )
 
-            # В методе stats_visualization
-            buf = BytesIO()
-            plt.savefig(buf, format='png', bbox_inches='tight')
-            buf.seek(0)
-            image_data = buf.getvalue()  # Получаем байты
-            photo = BufferedInputFile(image_data, filename="stats.png")  # Создаем InputFile
+            loop = asyncio.get_running_loop()
+            image_data = await loop.run_in_executor(self._render_pool, self._render_stats_png, posts)
+            photo = BufferedInputFile(image_data, filename="stats.png")
             return summary, InputMediaPhoto(media=photo, caption=summary)
             
         except Exception as e:
             logger.error(f"Stats visualization error: {str(e)}")
             return "📊 Статистика недоступна", None
 
-    async def settings_menu(self, user_id: int) -> InlineKeyboardMarkup:
-        theme = self.get_theme(user_id)
-        builder = InlineKeyboardBuilder()
-        
-        builder.button(
-            text=f"{theme['text']} Основные", 
-            callback_data="settings_general"
-        )
-        builder.button(
-            text=f"{theme['text']} Изображения", 
-            callback_data="settings_images"
-        )
-        builder.button(
-            text=f"{theme['text']} AI", 
-            callback_data="settings_ai"
-        )
-        builder.button(
-            text=f"{theme['text']} RSS", 
-            callback_data="settings_rss"
-        )
-        builder.button(
-            text=f"{theme['text']} Оповещения", 
-            callback_data="settings_notify"
-        )
-        builder.button(
-            text=f"{theme['primary']} Назад", 
-            callback_data="main_menu"
-        )
-        
-        builder.adjust(2, 2, 2, 1)
-        return builder.as_markup()
+    def settings_menu(self, user_id: int) -> InlineKeyboardMarkup:
+        return self._menu_cache[('settings', self.get_theme_name(user_id))]
 
     async def image_settings_view(self, user_id: int) -> tuple:
         """Возвращает визуальное представление настроек изображений"""
@@ -211,33 +476,25 @@ class UIBuilder:
             f"▸ Ширина обводки: <b>{self.config.STROKE_WIDTH}px</b>"
         )
         
-        # Создаем пример изображения
+        # Создаем пример изображения (кэшируется по набору настроек)
+        key = (
+            self.config.IMAGE_SOURCE,
+            tuple(self.config.TEXT_COLOR),
+            tuple(self.config.STROKE_COLOR),
+            self.config.STROKE_WIDTH,
+            self.config.FONTS_DIR,
+            self.config.DEFAULT_FONT
+        )
         try:
-            from PIL import Image, ImageDraw, ImageFont
-            img = Image.new('RGB', (400, 200), (40, 40, 60))
-            draw = ImageDraw.Draw(img)
-            
-            # Загрузка шрифта
-            font_path = os.path.join(self.config.FONTS_DIR, self.config.DEFAULT_FONT)
-            font = ImageFont.truetype(font_path, 32) if os.path.exists(font_path) else ImageFont.load_default()
-            
-            # Текст с текущими настройками
-            draw.text(
-                (200, 100), 
-                "Пример текста", 
-                fill=tuple(self.config.TEXT_COLOR),
-                stroke_fill=tuple(self.config.STROKE_COLOR),
-                stroke_width=self.config.STROKE_WIDTH,
-                font=font,
-                anchor="mm"
-            )
-            
-            # Сохраняем в буфер
-            # В методе image_settings_view
-            buf = BytesIO()
-            img.save(buf, format='PNG')
-            buf.seek(0)
-            image_data = buf.getvalue()
+            image_data = self._preview_cache.get(key)
+            if image_data is None:
+                loop = asyncio.get_running_loop()
+                image_data = await loop.run_in_executor(self._render_pool, self._render_preview_png)
+                self._preview_cache[key] = image_data
+                if len(self._preview_cache) > _PREVIEW_CACHE_SIZE:
+                    self._preview_cache.popitem(last=False)
+            else:
+                self._preview_cache.move_to_end(key)
             photo = BufferedInputFile(image_data, filename="preview.png")
             return text, InputMediaPhoto(media=photo, caption=text)
             
@@ -245,39 +502,47 @@ class UIBuilder:
             logger.error(f"Preview generation failed: {str(e)}")
             return text, None
 
-    async def theme_selector(self, user_id: int) -> InlineKeyboardMarkup:
-        builder = InlineKeyboardBuilder()
-        
-        for theme_name in self.THEMES:
-            builder.button(
-                text=f"{self.THEMES[theme_name]['primary']} {theme_name.capitalize()}",
-                callback_data=f"set_theme_{theme_name}"
-            )
-        
-        builder.button(
-            text="◀️ Назад",
-            callback_data="settings"
+    def _render_preview_png(self) -> bytes:
+        """Рисует пример текста с текущими настройками изображений и кодирует в PNG"""
+        from PIL import Image, ImageDraw
+        img = Image.new('RGB', (400, 200), (40, 40, 60))
+        draw = ImageDraw.Draw(img)
+        
+        # Загрузка шрифта
+        font = _load_font(os.path.join(self.config.FONTS_DIR, self.config.DEFAULT_FONT), 32)
+        
+        # Текст с текущими настройками
+        draw.text(
+            (200, 100), 
+            "Пример текста", 
+            fill=tuple(self.config.TEXT_COLOR),
+            stroke_fill=tuple(self.config.STROKE_COLOR),
+            stroke_width=self.config.STROKE_WIDTH,
+            font=font,
+            anchor="mm"
         )
         
-        builder.adjust(2, 1)
-        return builder.as_markup()
+        # Сохраняем в буфер
+        return _encode_png(img, optimize=False, compress_level=1)
 
-    async def progress_bar(self, current: int, total: int) -> str:
+    def theme_selector(self, user_id: int) -> InlineKeyboardMarkup:
+        return self._menu_cache[('theme_selector', None)]
+
+    @staticmethod
+    def progress_bar(current: int, total: int) -> str:
         """Генерирует текстовый прогресс-бар"""
-        bar_length = 10
-        filled = int(bar_length * current / total)
-        empty = bar_length - filled
-        return f"[{'■' * filled}{'□' * empty}] {current}/{total}"
+        filled = min(10, int(10 * current / total))
+        return f"{UIBuilder._BAR_CACHE[filled]} {current}/{total}"
 
     async def animated_processing(self, message, process_name: str, duration: int = 5):
         """Отображает анимированный процесс"""
-        status_msg = await message.answer(f"🔄 {process_name}...")
+        # Три состояния вместо покадровой анимации: каждое обновление - запрос к Telegram API
+        status_msg = await message.answer(f"⏳ {process_name}\n{self._PROCESS_BARS[0]} 0%")
         
-        for i in range(1, 11):
-            await asyncio.sleep(duration / 10)
-            bar = "⬛" * i + "⬜" * (10 - i)
-            await status_msg.edit_text(f"⏳ {process_name}\n{bar} {i*10}%")
+        await asyncio.sleep(duration / 2)
+        await status_msg.edit_text(f"⏳ {process_name}\n{self._PROCESS_BARS[5]} 50%")
         
+        await asyncio.sleep(duration / 2)
         await status_msg.edit_text(f"✅ {process_name} завершено!")
 
     async def rss_feed_status(self, feeds: list) -> str:
@@ -285,9 +550,8 @@ class UIBuilder:
         lines = ["📡 <b>Статус RSS-лент</b>\n"]
         
         for feed in feeds:
-            status_icon = '🟢' if feed.get('active', True) else '🔴'
-            error_icon = f"❗️ {feed.get('error_count', 0)}" if feed.get('error_count', 0) > 0 else ""
-            lines.append(f"{status_icon} {feed['url']} {error_icon}")
+            error_icon = f"❗️ {feed.error_count}" if feed.error_count > 0 else ""
+            lines.append(f"{self.STATUS_ICONS[feed.active]} {feed.url} {error_icon}")
         
         return "\n".join(lines)
     
@@ -309,61 +573,62 @@ class UIBuilder:
             f"• Мин. задержка между постами: {settings['min_delay']} сек {'✏️' if edit_mode else ''}"
         )
         
-        builder = InlineKeyboardBuilder()
         if edit_mode:
-            builder.button(text="✏️ Интервал", callback_data="edit_general_check_interval")
-            builder.button(text="✏️ Макс. постов", callback_data="edit_general_max_posts")
-            builder.button(text="✏️ Постов/час", callback_data="edit_general_posts_per_hour")
-            builder.button(text="✏️ Задержка", callback_data="edit_general_min_delay")
-            builder.button(text="💾 Сохранить", callback_data="save_general_settings")
-            builder.button(text="❌ Отмена", callback_data="cancel_general_edit")
-            builder.adjust(2, 2, 1)
+            rows = [
+                [
+                    InlineKeyboardButton(text="✏️ Интервал", callback_data="edit_general_check_interval"),
+                    InlineKeyboardButton(text="✏️ Макс. постов", callback_data="edit_general_max_posts")
+                ],
+                [
+                    InlineKeyboardButton(text="✏️ Постов/час", callback_data="edit_general_posts_per_hour"),
+                    InlineKeyboardButton(text="✏️ Задержка", callback_data="edit_general_min_delay")
+                ],
+                [InlineKeyboardButton(text="💾 Сохранить", callback_data="save_general_settings")],
+                [InlineKeyboardButton(text="❌ Отмена", callback_data="cancel_general_edit")]
+            ]
         else:
-            builder.button(text="✏️ Редактировать", callback_data="edit_general_settings")
-            builder.button(text="◀️ Назад", callback_data="settings")
+            rows = [[
+                InlineKeyboardButton(text="✏️ Редактировать", callback_data="edit_general_settings"),
+                InlineKeyboardButton(text="◀️ Назад", callback_data="settings")
+            ]]
         
-        return text, builder.as_markup()
+        return text, InlineKeyboardMarkup(inline_keyboard=rows)
 
-    async def general_param_selector(self, user_id: int, param: str) -> InlineKeyboardMarkup:
+    def general_param_selector(self, user_id: int, param: str) -> InlineKeyboardMarkup:
         """Клавиатура выбора значений для основных параметров"""
-        current_value = self.config.__dict__.get(param.upper())
+        current_value = getattr(self.config, param.upper(), None)
         if user_id in self.user_general_editing_states:
             current_value = self.user_general_editing_states[user_id].get(param, current_value)
         
-        presets = {
-            'check_interval': [60, 300, 600, 1800],
-            'max_posts': [1, 3, 5, 10],
-            'posts_per_hour': [10, 20, 30, 50],
-            'min_delay': [10, 30, 60, 120]
-        }
+        presets = _GENERAL_PRESETS.get(param, ())
+        marker_idx = presets.index(current_value) if current_value in presets else -1
         
-        builder = InlineKeyboardBuilder()
-        for value in presets.get(param, []):
-            builder.button(
-                text=f"{'✅ ' if value == current_value else ''}{value}",
+        buttons = [
+            InlineKeyboardButton(
+                text=_PRESET_LABELS[value][i == marker_idx],
                 callback_data=f"set_general_{param}:{value}"
             )
-        
-        builder.button(text="🔢 Вручную", callback_data=f"set_general_{param}_custom")
-        builder.button(text="◀️ Назад", callback_data="edit_general_settings")
-        builder.adjust(2, 2, 1)
-        return builder.as_markup()
+            for i, value in enumerate(presets)
+        ]
+        buttons.append(InlineKeyboardButton(text="🔢 Вручную", callback_data=f"set_general_{param}_custom"))
+        buttons.append(InlineKeyboardButton(text="◀️ Назад", callback_data="edit_general_settings"))
+        return InlineKeyboardMarkup(inline_keyboard=_chunk(buttons, (2, 2, 1)))
     
-    async def start_general_edit(self, user_id: int):
+    def start_general_edit(self, user_id: int):
         """Начинает редактирование основных настроек"""
-        self.user_general_editing_states[user_id] = {
+        self.user_general_editing_states.start(user_id, {
             'check_interval': self.config.CHECK_INTERVAL,
             'max_posts': self.config.MAX_POSTS_PER_CYCLE,
             'posts_per_hour': self.config.POSTS_PER_HOUR,
             'min_delay': self.config.MIN_DELAY_BETWEEN_POSTS
-        }
+        })
     
-    async def update_general_setting(self, user_id: int, param: str, value: Any):
+    def update_general_setting(self, user_id: int, param: str, value: Any):
         """Обновляет временную настройку"""
         if user_id in self.user_general_editing_states:
             self.user_general_editing_states[user_id][param] = value
     
-    async def save_general_settings(self, user_id: int) -> Dict[str, Any]:
+    def save_general_settings(self, user_id: int) -> Dict[str, Any]:
         """Сохраняет настройки и возвращает изменения"""
         if user_id not in self.user_general_editing_states:
             return {}
@@ -385,13 +650,13 @@ class UIBuilder:
         
         return changes
     
-    async def cancel_general_edit(self, user_id: int) -> None:
+    def cancel_general_edit(self, user_id: int) -> None:
         """Сбрасывает состояние редактирования общих настроек"""
         if user_id in self.user_general_editing_states:
             del self.user_general_editing_states[user_id]
         logger.debug(f"Сброшено состояние редактирования для {user_id}")
     
-    async def cancel_ai_edit(self, user_id: int) -> None:
+    def cancel_ai_edit(self, user_id: int) -> None:
         """Сбрасывает состояние редактирования AI настроек"""
         if user_id in self.ai_edit_states:
             del self.ai_edit_states[user_id]
@@ -419,98 +684,97 @@ class UIBuilder:
             f"• Макс. токенов: {settings['max_tokens']} {'✏️' if edit_mode else ''}"
         )
         
-        builder = InlineKeyboardBuilder()
-        
         if edit_mode:
-            # Единый стиль кнопок с иконкой карандаша
-            builder.button(text="✏️ Модель", callback_data="edit_ai_model")
-            builder.button(text="✏️ Температура", callback_data="edit_ai_temp")
-            builder.button(text="✏️ Токены", callback_data="edit_ai_tokens")
-            builder.button(
-                text=f"{'🔴 Выключить' if settings['enabled'] else '🟢 Включить'} ИИ",
-                callback_data="toggle_ai_enabled"
-            )
-
-            # Группировка кнопок как в основных настройках
-            builder.button(text="💾 Сохранить", callback_data="save_ai_settings")
-            builder.button(text="❌ Отмена", callback_data="cancel_ai_edit")
-            
-            # Аналогичная структура расположения
-            builder.adjust(2, 1)  # 2 в первом ряду, 1 во втором
+            # Единый стиль кнопок с иконкой карандаша: 2 в первом ряду, остальные по одной
+            rows = [
+                [
+                    InlineKeyboardButton(text="✏️ Модель", callback_data="edit_ai_model"),
+                    InlineKeyboardButton(text="✏️ Температура", callback_data="edit_ai_temp")
+                ],
+                [InlineKeyboardButton(text="✏️ Токены", callback_data="edit_ai_tokens")],
+                [InlineKeyboardButton(
+                    text=f"{'🔴 Выключить' if settings['enabled'] else '🟢 Включить'} ИИ",
+                    callback_data="toggle_ai_enabled"
+                )],
+                [InlineKeyboardButton(text="💾 Сохранить", callback_data="save_ai_settings")],
+                [InlineKeyboardButton(text="❌ Отмена", callback_data="cancel_ai_edit")]
+            ]
         else:
-            # Стандартные кнопки управления
-            builder.button(
-                text=f"{theme['primary']} Редактировать", 
-                callback_data="edit_ai_settings"
-            )
-            builder.button(
-                text=f"{theme['text']} Назад", 
-                callback_data="settings"
-            )
-            builder.adjust(2)  # обе кнопки в одном ряду
+            # Стандартные кнопки управления в одном ряду
+            rows = [[
+                InlineKeyboardButton(text=theme['labels']['edit'], callback_data="edit_ai_settings"),
+                InlineKeyboardButton(text=theme['labels']['back'], callback_data="settings")
+            ]]
         
-        return text, builder.as_markup()
+        return text, InlineKeyboardMarkup(inline_keyboard=rows)
 
-    async def ai_model_selector(self, user_id: int) -> InlineKeyboardMarkup:
+    def ai_model_selector(self, user_id: int) -> InlineKeyboardMarkup:
         """Клавиатура выбора модели AI"""
         current_model = self.config.YAGPT_MODEL
         if user_id in self.user_editing_states:
             current_model = self.user_editing_states[user_id].get('model', current_model)
         
-        builder = InlineKeyboardBuilder()
-        for model in ['yandexgpt-lite', 'yandexgpt-pro']:
-            builder.button(
-                text=f"{'✅ ' if model == current_model else ''}{model}",
+        marker_idx = _AI_MODELS.index(current_model) if current_model in _AI_MODELS else -1
+        
+        rows = [
+            [InlineKeyboardButton(
+                text=_PRESET_LABELS[model][i == marker_idx],
                 callback_data=f"set_ai_model:{model}"
-            )
-        builder.button(text="◀️ Назад", callback_data="edit_ai_settings")
-        builder.adjust(1, 1)
-        return builder.as_markup()
+            )]
+            for i, model in enumerate(_AI_MODELS)
+        ]
+        rows.append([InlineKeyboardButton(text="◀️ Назад", callback_data="edit_ai_settings")])
+        return InlineKeyboardMarkup(inline_keyboard=rows)
 
-    async def ai_temp_selector(self, user_id: int) -> InlineKeyboardMarkup:
+    def ai_temp_selector(self, user_id: int) -> InlineKeyboardMarkup:
         """Клавиатура выбора температуры"""
         current_temp = self.config.YAGPT_TEMPERATURE
         if user_id in self.user_editing_states:
             current_temp = self.user_editing_states[user_id].get('temperature', current_temp)
         
-        builder = InlineKeyboardBuilder()
-        for temp in [0.1, 0.3, 0.5, 0.7, 0.9]:
-            builder.button(
-                text=f"{'✅ ' if abs(temp - current_temp) < 0.01 else ''}{temp}",
+        # Температура - float, поэтому сравнение с допуском, один раз до построения кнопок
+        marker_idx = next((i for i, temp in enumerate(_AI_TEMP_PRESETS) if abs(temp - current_temp) < 0.01), -1)
+        
+        buttons = [
+            InlineKeyboardButton(
+                text=_PRESET_LABELS[temp][i == marker_idx],
                 callback_data=f"set_ai_temp:{temp}"
             )
-        builder.button(text="🔢 Вручную", callback_data="set_ai_temp_custom")
-        builder.button(text="◀️ Назад", callback_data="edit_ai_settings")
-        builder.adjust(2, 2, 2, 1)
-        return builder.as_markup()
+            for i, temp in enumerate(_AI_TEMP_PRESETS)
+        ]
+        buttons.append(InlineKeyboardButton(text="🔢 Вручную", callback_data="set_ai_temp_custom"))
+        buttons.append(InlineKeyboardButton(text="◀️ Назад", callback_data="edit_ai_settings"))
+        return InlineKeyboardMarkup(inline_keyboard=_chunk(buttons, (2, 2, 2, 1)))
 
-    async def ai_tokens_selector(self, user_id: int) -> InlineKeyboardMarkup:
+    def ai_tokens_selector(self, user_id: int) -> InlineKeyboardMarkup:
         """Клавиатура выбора токенов"""
         current_tokens = self.config.YAGPT_MAX_TOKENS
         if user_id in self.user_editing_states:
             current_tokens = self.user_editing_states[user_id].get('max_tokens', current_tokens)
         
-        builder = InlineKeyboardBuilder()
-        for tokens in [1000, 2000, 3000, 4000, 5000]:
-            builder.button(
-                text=f"{'✅ ' if tokens == current_tokens else ''}{tokens}",
+        marker_idx = _AI_TOKEN_PRESETS.index(current_tokens) if current_tokens in _AI_TOKEN_PRESETS else -1
+        
+        buttons = [
+            InlineKeyboardButton(
+                text=_PRESET_LABELS[tokens][i == marker_idx],
                 callback_data=f"set_ai_tokens:{tokens}"
             )
-        builder.button(text="🔢 Вручную", callback_data="set_ai_tokens_custom")
-        builder.button(text="◀️ Назад", callback_data="edit_ai_settings")
-        builder.adjust(2, 2, 2, 1)
-        return builder.as_markup()
+            for i, tokens in enumerate(_AI_TOKEN_PRESETS)
+        ]
+        buttons.append(InlineKeyboardButton(text="🔢 Вручную", callback_data="set_ai_tokens_custom"))
+        buttons.append(InlineKeyboardButton(text="◀️ Назад", callback_data="edit_ai_settings"))
+        return InlineKeyboardMarkup(inline_keyboard=_chunk(buttons, (2, 2, 2, 1)))
 
-    async def start_ai_edit(self, user_id: int):
+    def start_ai_edit(self, user_id: int):
         """Начинает редактирование настроек AI для пользователя"""
-        self.user_editing_states[user_id] = {
+        self.user_editing_states.start(user_id, {
             'enabled': self.config.ENABLE_YAGPT,
             'model': self.config.YAGPT_MODEL,
             'temperature': self.config.YAGPT_TEMPERATURE,
             'max_tokens': self.config.YAGPT_MAX_TOKENS
-        }
+        })
 
-    async def update_ai_setting(self, user_id: int, key: str, value: Any):
+    def update_ai_setting(self, user_id: int, key: str, value: Any):
         """Обновляет временную настройку"""
         if key == 'enabled':  # Специальная обработка для переключения
             if user_id in self.user_editing_states:
@@ -518,7 +782,7 @@ class UIBuilder:
         elif user_id in self.user_editing_states:
             self.user_editing_states[user_id][key] = value
 
-    async def save_ai_settings(self, user_id: int) -> Dict[str, Any]:
+    def save_ai_settings(self, user_id: int) -> Dict[str, Any]:
         """Сохраняет настройки и возвращает изменения"""
         if user_id not in self.user_editing_states:
             return {}
@@ -540,103 +804,87 @@ class UIBuilder:
         
         return changes
 
-    async def cancel_ai_edit(self, user_id: int):
+    def cancel_ai_edit(self, user_id: int):
         """Отменяет редактирование настроек AI"""
         if user_id in self.user_editing_states:
             self.user_editing_states.pop(user_id)
     
+    @staticmethod
+    def _format_feed_line(index: int, feed, show_last_check: bool) -> str:
+        """Строка списка RSS-лент: номер, статус, URL, ошибки и (опционально) время проверки"""
+        error_icon = f" ❗️ {feed.error_count}" if feed.error_count > 0 else ""
+        last_check = f" 📅 {feed.last_check}" if show_last_check and feed.last_check else ""
+        return f"{index + 1}. {UIBuilder.STATUS_ICONS[feed.active]} {_truncate_url(feed.url)}{error_icon}{last_check}\n"
+    
     async def rss_settings_view(self, feeds: list, edit_mode: bool = False) -> tuple:
         """Интерактивный интерфейс управления RSS-лентами с режимом редактирования"""
         # Обработка случая, когда нет RSS-лент
         if not feeds:
             text = "📡 <b>Нет RSS-лент</b>\n\nИспользуйте кнопку ниже, чтобы добавить новую ленту"
-            builder = InlineKeyboardBuilder()
-            
-            if edit_mode:
-                builder.button(text="➕ Добавить ленту", callback_data="rss_add_start")
-                builder.button(text="◀️ Назад", callback_data="settings")
-                builder.adjust(1)
-            else:
-                builder.button(text="➕ Добавить ленту", callback_data="rss_add_start")
-                builder.button(text="◀️ Назад", callback_data="settings")
-                builder.adjust(1)
+            rows = [
+                [InlineKeyboardButton(text="➕ Добавить ленту", callback_data="rss_add_start")],
+                [InlineKeyboardButton(text="◀️ Назад", callback_data="settings")]
+            ]
             
-            keyboard = builder.as_markup()
-            keyboard.inline_message_id = f"rss_{int(time.time())}"  # Уникальный ID
-            return text, keyboard
+            return text, InlineKeyboardMarkup(inline_keyboard=rows)
         
         # Режим редактирования
         if edit_mode:
-            text = "📡 <b>Редактирование RSS-лент</b>\n\n"
-            for i, feed in enumerate(feeds):
-                status = "🟢" if feed.get('active', True) else "🔴"
-                error_icon = f" ❗️ {feed.get('error_count', 0)}" if feed.get('error_count', 0) > 0 else ""
-                # Обрезаем длинные URL для отображения
-                url_display = feed['url']
-                if len(url_display) > 50:
-                    url_display = url_display[:25] + "..." + url_display[-25:]
-                text += f"{i+1}. {status} {url_display}{error_icon}\n"
-            
-            builder = InlineKeyboardBuilder()
+            text = "📡 <b>Редактирование RSS-лент</b>\n\n" + ''.join(
+                [self._format_feed_line(i, feed, show_last_check=False) for i, feed in enumerate(feeds)]
+            )
             
-            # Кнопки действий для каждой ленты
+            # Кнопки действий для каждой ленты: по 2 в ряду
+            rows = []
             for i, feed in enumerate(feeds):
-                action = "disable" if feed.get('active', True) else "enable"
-                builder.button(
-                    text=f"{'⏸' if action == 'disable' else '▶️'} Лента {i+1}",
-                    callback_data=f"rss_toggle_{i}_{action}"
-                )
-                builder.button(
-                    text=f"❌ Удалить {i+1}",
-                    callback_data=f"rss_remove_{i}"
-                )
+                action = "disable" if feed.active else "enable"
+                rows.append([
+                    InlineKeyboardButton(
+                        text=f"{'⏸' if action == 'disable' else '▶️'} Лента {i+1}",
+                        callback_data=f"rss_toggle_{i}_{action}"
+                    ),
+                    InlineKeyboardButton(text=f"❌ Удалить {i+1}", callback_data=f"rss_remove_{i}")
+                ])
             
             # Общие действия
-            builder.button(text="➕ Добавить ленту", callback_data="rss_add_start")
-            builder.button(text="💾 Сохранить", callback_data="save_rss_settings")
-            builder.button(text="❌ Отмена", callback_data="rss_settings")
-            
-            # Группировка кнопок: 2 кнопки на ленту, затем общие кнопки
-            builder.adjust(2, *[2 for _ in range(len(feeds))], 1, 1)
+            rows.append([
+                InlineKeyboardButton(text="➕ Добавить ленту", callback_data="rss_add_start"),
+                InlineKeyboardButton(text="💾 Сохранить", callback_data="save_rss_settings")
+            ])
+            rows.append([InlineKeyboardButton(text="❌ Отмена", callback_data="rss_settings")])
         # Обычный режим просмотра
         else:
-            text = "📡 <b>Текущие RSS-ленты</b>\n\n"
-            for i, feed in enumerate(feeds):
-                status = '🟢' if feed.get('active', True) else '🔴'
-                error_icon = f" ❗️ {feed.get('error_count', 0)}" if feed.get('error_count', 0) > 0 else ""
-                last_check = f" 📅 {feed.get('last_check', 'никогда')}" if feed.get('last_check') else ""
-                # Обрезаем длинные URL для отображения
-                url_display = feed['url']
-                if len(url_display) > 50:
-                    url_display = url_display[:25] + "..." + url_display[-25:]
-                text += f"{i+1}. {status} {url_display}{error_icon}{last_check}\n"
+            text = "📡 <b>Текущие RSS-ленты</b>\n\n" + ''.join(
+                [self._format_feed_line(i, feed, show_last_check=True) for i, feed in enumerate(feeds)]
+            )
             
-            builder = InlineKeyboardBuilder()
-            builder.button(text="✏️ Редактировать", callback_data="edit_rss_settings")
-            builder.button(text="🔄 Обновить статус", callback_data="rss_refresh")
-            builder.button(text="◀️ Назад", callback_data="settings")
-            builder.adjust(2, 1)  # Редактировать и Обновить в одной строке, Назад отдельно
+            # Редактировать и Обновить в одной строке, Назад отдельно
+            rows = [
+                [
+                    InlineKeyboardButton(text="✏️ Редактировать", callback_data="edit_rss_settings"),
+                    InlineKeyboardButton(text="🔄 Обновить статус", callback_data="rss_refresh")
+                ],
+                [InlineKeyboardButton(text="◀️ Назад", callback_data="settings")]
+            ]
         
-        keyboard = builder.as_markup()
-        keyboard.inline_message_id = f"rss_{int(time.time())}"  # Уникальный ID
-        return text, keyboard
+        return text, InlineKeyboardMarkup(inline_keyboard=rows)
     
-    async def rss_add_dialog(self) -> InlineKeyboardMarkup:
+    def rss_add_dialog(self) -> InlineKeyboardMarkup:
         """Диалог добавления RSS"""
-        builder = InlineKeyboardBuilder()
-        builder.button(text="❌ Отмена", callback_data="rss_settings")
-        return builder.as_markup()
+        return self._menu_cache[('rss_add', None)]
     
-    async def rss_remove_selector(self, feeds: list) -> InlineKeyboardMarkup:
+    def rss_remove_selector(self, feeds: list) -> InlineKeyboardMarkup:
         """Выбор ленты для удаления"""
-        builder = InlineKeyboardBuilder()
-        
-        for i in range(len(feeds)):
-            builder.button(
-                text=f"❌ Удалить {i+1}",
-                callback_data=f"rss_remove_{i}"
-            )
-        
-        builder.button(text="◀️ Назад", callback_data="rss_settings")
-        builder.adjust(2, 2, 1)
-        return builder.as_markup()
\ No newline at end of file
+        buttons = [
+            InlineKeyboardButton(text=f"❌ Удалить {i+1}", callback_data=f"rss_remove_{i}")
+            for i in range(len(feeds))
+        ]
+        buttons.append(InlineKeyboardButton(text="◀️ Назад", callback_data="rss_settings"))
+        return InlineKeyboardMarkup(inline_keyboard=_chunk(buttons, (2, 2, 1)))
+
+
+# Подписи кнопок собираются один раз на тему, меню только читают готовые строки
+for _name, _theme in UIBuilder.THEMES.items():
+    _theme['labels'] = {key: f"{_theme[color]} {text}" for key, (color, text) in _THEME_LABELS.items()}
+    _theme['labels']['selector'] = f"{_theme['primary']} {_name.capitalize()}"
+del _name, _theme
@@ -1,13 +1,161 @@
 import logging
 import json
 import re
-import html
 import aiohttp
 import asyncio
-from typing import Dict, Optional
+import functools
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson не установлен - используется стандартный json
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick не установлен - подстроки проверяются по одной
+    ahocorasick = None
 
 logger = logging.getLogger('AsyncYandexGPT')
 
+# Разбор JSON-ответа API: orjson быстрее стандартного json
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_bytes(value: Any) -> bytes:
+    """Сериализует значение в JSON (байты UTF-8) для тела запроса"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode()
+
+
+def _json_text(value: Any) -> str:
+    """Сериализует значение в JSON-строку для логов (без экранирования не-ASCII)"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, ensure_ascii=False)
+
+# Окончание шаблона запроса после пустого текста сообщения: '"text": ""}]}'
+_REQUEST_TAIL = b'}]}'
+_EMPTY_TEXT_TAIL = b'""' + _REQUEST_TAIL
+
+# Сетевые ошибки запроса: тип -> (код статуса, описание); порядок важен,
+# т.к. таймауты aiohttp одновременно являются ошибками соединения
+_ERROR_MAP = (
+    (asyncio.TimeoutError, 408, "Timeout"),
+    (aiohttp.ClientConnectionError, 503, "Connection error"),
+)
+
+# Максимальное количество закэшированных ответов
+_CACHE_MAX_SIZE = 1024
+# Метка в кэше для входных данных, на которые API уже вернул низкокачественный ответ
+_LOW_QUALITY = object()
+_LOW_QUALITY_TTL = 300  # секунды
+
+# Управляющие символы, удаляемые из текста
+_CONTROL_RE = re.compile(r'[\x00-\x1F\x7F-\x9F]')
+
+# Замены для безопасной подстановки текста в промпт: HTML-экранирование (как html.escape)
+# и защита от инъекций объединены в одну таблицу для одного прохода str.translate.
+# Кавычки заменяются HTML-сущностями, поэтому до экранирования обратной косой они не доходят
+_PROMPT_TRANS = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+    '{': '{{',
+    '}': '}}',
+    '[': '【',
+    ']': '】',
+    '(': '（',
+    ')': '）',
+    '\n': ' ',
+    '\r': ' ',
+    '\t': ' '
+})
+
+# Символы, при отсутствии которых экранирование не меняет текст
+_PROMPT_TRIGGER_RE = re.compile(r'[&<>"\'{}\[\]()\x00-\x1F\x7F-\x9F]')
+_SANITIZE_TRIGGER_RE = re.compile(r'[&<>"\'\x00-\x1F\x7F-\x9F]')
+
+# Экранирование для Telegram HTML
+_SANITIZE_TRANS = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&apos;'
+})
+
+# Признаки низкокачественного ответа (проверяются по тексту в нижнем регистре):
+# обычные подстроки ищутся через `in`, регулярное выражение нужно только для Markdown ссылок
+_QUALITY_SUBSTRINGS = (
+    "в интернете есть много сайтов",
+    "посмотрите, что нашлось в поиске",
+    "дополнительные материалы:",
+    "смотрите также:",
+    "читайте далее",
+    "читайте также",
+    "рекомендуем прочитать",
+    "подробнее на сайте",
+    "другие источники:",
+    "больше информации можно найти"
+)
+_QUALITY_RE = re.compile(r"\[.*\]\(https?://[^\)]+\)")  # Markdown ссылки
+
+
+def _build_quality_automaton():
+    """Автомат Ахо-Корасик: все фразы ищутся за один проход по тексту"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for phrase in _QUALITY_SUBSTRINGS:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+_QUALITY_AUTOMATON = _build_quality_automaton()
+
+# Расширенные шаблоны для извлечения заголовка и описания из ответа
+_PARSE_PATTERNS = [re.compile(pattern, re.DOTALL | re.IGNORECASE) for pattern in (
+    r'(?i)title["\']?:\s*["\'](.+?)["\']',
+    r'(?i)заголовок["\']?:\s*["\'](.+?)["\']',
+    r'(?i)(?:title|заголовок)[\s:]*["\']?(.+?)["\']?(?:\n|$|\.)',
+    r'(?i)(?:description|описание)[\s:]*["\']?(.+?)["\']?(?:\n|$|\.)',
+    r'{"title"\s*:\s*"([^"]+)"[^}]*"description"\s*:\s*"([^"]+)"}',
+    r'<title>(.+?)</title>\s*<description>(.+?)</description>',
+    r'(?i)(?:заголовок|title):?\s*([^\n]+)\n+(?:описание|description):?\s*([^\n]+)'
+)]
+# Шаблоны с двумя группами (заголовок и описание) - только они дают описание
+_PAIR_PATTERNS = [pattern for pattern in _PARSE_PATTERNS if pattern.groups >= 2]
+# Разбор JSON-объекта, встроенного в текст ответа
+_JSON_DECODER = json.JSONDecoder()
+_PARAGRAPH_SPLIT_RE = re.compile(r'\n\n|\n-|\n•')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]\s+')
+
+# Одни и те же заголовки и описания приходят повторно (повторы лент, ретраи),
+# поэтому результаты экранирования кэшируются по строке
+@functools.lru_cache(maxsize=2048)
+def _sanitize_prompt(text: str) -> str:
+    """Экранирование строки для подстановки в промпт"""
+    # Быстрый путь: в чистом тексте нечего экранировать
+    if not _PROMPT_TRIGGER_RE.search(text):
+        return text[:5000]
+    return _CONTROL_RE.sub('', text.translate(_PROMPT_TRANS))[:5000]
+
+
+@functools.lru_cache(maxsize=2048)
+def _sanitize_html(text: str) -> str:
+    """Удаление управляющих символов и экранирование для Telegram HTML"""
+    if not _SANITIZE_TRIGGER_RE.search(text):
+        return text
+    return _CONTROL_RE.sub('', text).translate(_SANITIZE_TRANS)
+
+
 class AsyncYandexGPT:
     def __init__(self, config, session: aiohttp.ClientSession):
         self.config = config
@@ -30,6 +178,12 @@ class AsyncYandexGPT:
         self.consecutive_errors = 0
         self.max_consecutive_errors = 3  # Максимум ошибок перед автоотключением
 
+        # Кэш ответов: ключ запроса -> (время истечения, результат)
+        self._cache: OrderedDict = OrderedDict()
+
+        # Ограничение параллельных запросов к API при пакетной обработке
+        self._semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_GPT_REQUESTS)
+
         # Корректные URI для моделей (исправлено для Pro)
         self.MODEL_URIS = {
             'lite': f"gpt://{config.YANDEX_FOLDER_ID}/yandexgpt-lite/latest",
@@ -42,12 +196,64 @@ class AsyncYandexGPT:
             "x-folder-id": config.YANDEX_FOLDER_ID,
             "Content-Type": "application/json"
         }
+
+        # Производные от модели параметры запроса (пересчитываются при смене настроек)
+        self._model_key = None
+        self._sync_model_settings()
         logger.info(f"YandexGPT initialized. Active: {self.active}, Model: {config.YAGPT_MODEL}")
 
+    @classmethod
+    def make_session(cls, config) -> aiohttp.ClientSession:
+        """
+        Создает отдельную сессию для API с keep-alive и лимитом соединений на хост,
+        достаточным для enhance_many (в 2 раза больше MAX_CONCURRENT_GPT_REQUESTS)
+        """
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=config.MAX_CONCURRENT_GPT_REQUESTS * 2,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    def _sync_model_settings(self) -> None:
+        """Обновляет параметры и шаблон запроса, если модель, лимит или температура изменились"""
+        key = (self.config.YAGPT_MODEL, self.config.YAGPT_MAX_TOKENS, self.config.YAGPT_TEMPERATURE)
+        if key == self._model_key:
+            return
+        model, max_tokens, temperature = key
+        self._is_pro = model == 'pro'
+        self._model_uri = self.MODEL_URIS.get(model, self.MODEL_URIS['lite'])
+        self._max_tokens_cap = min(max_tokens, 8000 if self._is_pro else 2000)
+        self._timeout = aiohttp.ClientTimeout(total=60 if self._is_pro else 30)
+
+        # Тело запроса сериализуется один раз без текста; на каждый запрос подставляется только промпт
+        template = _json_bytes({
+            "modelUri": self._model_uri,
+            "completionOptions": {
+                "stream": False,
+                "temperature": temperature,
+                "maxTokens": self._max_tokens_cap
+            },
+            "messages": [
+                {
+                    "role": "user",
+                    "text": ""
+                }
+            ]
+        })
+        self._request_prefix = template[:-len(_EMPTY_TEXT_TAIL)]
+        self._model_key = key
+
+    def _build_request_body(self, prompt: str) -> bytes:
+        """Собирает тело запроса из готового шаблона и промпта"""
+        return self._request_prefix + _json_bytes(prompt) + _REQUEST_TAIL
+
     def is_available(self) -> bool:
         """Проверяет, доступен ли сервис в текущий момент"""
         if not self.active:
             return False
+        self._sync_model_settings()
             
         # Критическая проверка: сессия закрыта?
         if self.session is None or self.session.closed:
@@ -56,36 +262,46 @@ class AsyncYandexGPT:
             return False
             
         # Более строгие ограничения для Pro-модели
-        if self.config.YAGPT_MODEL == 'pro':
+        if self._is_pro:
             return self.error_count < 3 and self.consecutive_errors < 2
             
         return self.error_count < self.config.YAGPT_ERROR_THRESHOLD
 
-    def _sanitize_prompt_input(self, text: str) -> str:
+    @staticmethod
+    def _cache_key(request_body: bytes) -> str:
+        """Ключ кэша: хэш тела запроса (модель, параметры генерации и промпт)"""
+        return hashlib.sha256(request_body).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict]:
+        """Возвращает неустаревший ответ из кэша"""
+        if self.config.YAGPT_CACHE_TTL <= 0:
+            return None
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Сохраняет ответ в кэш, вытесняя самые старые записи"""
+        cache_ttl = self.config.YAGPT_CACHE_TTL
+        if cache_ttl <= 0:
+            return
+        self._cache[key] = (time.monotonic() + (cache_ttl if ttl is None else ttl), value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > _CACHE_MAX_SIZE:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _sanitize_prompt_input(text: str) -> str:
         """Экранирует специальные символы и предотвращает инъекции в промпт"""
         if not isinstance(text, str):
             return ""
-
-        sanitized = html.escape(text)
-        replacements = {
-            '{': '{{',
-            '}': '}}',
-            '[': '【',
-            ']': '】',
-            '(': '（',
-            ')': '）',
-            '"': '\\"',
-            "'": "\\'",
-            '\n': ' ',
-            '\r': ' ',
-            '\t': ' '
-        }
-
-        for char, replacement in replacements.items():
-            sanitized = sanitized.replace(char, replacement)
-
-        sanitized = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', sanitized)
-        return sanitized[:5000]
+        return _sanitize_prompt(text)
 
     async def enhance(self, title: str, description: str) -> Optional[Dict]:
         """
@@ -102,14 +318,11 @@ class AsyncYandexGPT:
                 self.active = False
                 return None
 
-            # Подсчет токенов (простая оценка)
-            tokens = len(title.split()) + len(description.split())
+            # Подсчет токенов (простая оценка): в среднем ~4 символа на токен для смеси русского и английского
+            tokens = (len(title) + len(description)) >> 2
 
             # Проверка на превышение лимита токенов
-            max_tokens = min(
-                self.config.YAGPT_MAX_TOKENS,
-                8000 if self.config.YAGPT_MODEL == 'pro' else 2000
-            )
+            max_tokens = self._max_tokens_cap
             
             if tokens > max_tokens * 0.8:  # Оставляем запас
                 logger.warning(f"Content too long: {tokens}/{max_tokens} tokens")
@@ -121,60 +334,50 @@ class AsyncYandexGPT:
                 description=self._sanitize_prompt_input(description)
             )
 
-            # Получаем корректный URI модели
-            model_uri = self.MODEL_URIS.get(
-                self.config.YAGPT_MODEL,
-                self.MODEL_URIS['lite']  # Fallback
-            )
-
             # Подготовка данных для запроса
-            request_data = {
-                "modelUri": model_uri,
-                "completionOptions": {
-                    "stream": False,
-                    "temperature": self.config.YAGPT_TEMPERATURE,
-                    "maxTokens": max_tokens
-                },
-                "messages": [
-                    {
-                        "role": "user",
-                        "text": prompt
-                    }
-                ]
-            }
+            request_body = self._build_request_body(prompt)
+
+            # Повторяющиеся новости не отправляем в API повторно
+            cache_key = self._cache_key(request_body)
+            cached = self._cache_get(cache_key)
+            if cached is _LOW_QUALITY:
+                logger.debug("YandexGPT negative cache hit, skipping request")
+                return None
+            if cached is not None:
+                logger.debug("YandexGPT cache hit")
+                return cached
 
-            # Логирование для отладки
-            logger.debug(f"YandexGPT request to {self.config.YANDEX_API_ENDPOINT}")
-            logger.debug(f"Model: {self.config.YAGPT_MODEL}, URI: {model_uri}")
-            logger.debug(f"Prompt: {prompt[:200]}...")
+            # Логирование для отладки (строки собираются только при включенном DEBUG)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("YandexGPT request to %s", self.config.YANDEX_API_ENDPOINT)
+                logger.debug("Model: %s, URI: %s", self.config.YAGPT_MODEL, self._model_uri)
+                logger.debug("Prompt: %s...", prompt[:200])
 
             # Отправка запроса
             async with self.session.post(
                 self.config.YANDEX_API_ENDPOINT,
-                headers={
-                    "Authorization": f"Api-Key {self.config.YANDEX_API_KEY}",
-                    "Content-Type": "application/json",
-                    "x-folder-id": self.config.YANDEX_FOLDER_ID
-                },
-                json=request_data,
-                timeout=aiohttp.ClientTimeout(total=60 if self.config.YAGPT_MODEL == 'pro' else 30)
+                headers=self.headers,
+                data=request_body,
+                timeout=self._timeout
             ) as response:
 
-                response_text = await response.text()
-                
                 if response.status != 200:
-                    self._handle_error(response.status, response_text, request_data)
+                    response_text = await response.text()
+                    self._handle_error(response.status, response_text, request_body)
                     return None
 
+                # Тело читается один раз и сразу разбирается; текст нужен только для лога ошибки
                 try:
-                    data = await response.json()
-                except json.JSONDecodeError:
+                    data = await response.json(loads=_json_loads)
+                except (aiohttp.ContentTypeError, ValueError):
+                    response_text = await response.text()
                     logger.error(f"Invalid JSON response: {response_text[:500]}")
-                    self._handle_error(500, "Invalid JSON", request_data)
+                    self._handle_error(500, "Invalid JSON", request_body)
                     return None
 
                 # Логирование сырого ответа
-                logger.debug(f"Raw response: {json.dumps(data, ensure_ascii=False)[:500]}...")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Raw response: %s...", _json_text(data)[:500])
 
                 # Парсинг результата
                 parsed_response = self.parse_response(data)
@@ -186,47 +389,69 @@ class AsyncYandexGPT:
                     if self.is_low_quality_response(parsed_response['description']):
                         logger.warning("Low quality response detected")
                         self.stats['yagpt_errors'] += 1
+                        # Повторный запрос с теми же данными почти наверняка даст такой же результат
+                        self._cache_put(cache_key, _LOW_QUALITY, ttl=_LOW_QUALITY_TTL)
                         return None
                         
+                    self._cache_put(cache_key, parsed_response)
                     return parsed_response
                 
                 logger.warning("Failed to parse YandexGPT response")
-                self._handle_error(500, "Parsing failed", request_data)
+                self._handle_error(500, "Parsing failed", request_body)
                 return None
 
-        except asyncio.TimeoutError:
-            logger.error("Yandex GPT request timeout")
-            self._handle_error(408, "Timeout", {})
-            return None
-        except RuntimeError as e:
-            if "Session is closed" in str(e):
+        except Exception as e:
+            # Ожидаемые сетевые сбои: код статуса и краткое описание без трассировки
+            for error_type, status, tag in _ERROR_MAP:
+                if isinstance(e, error_type):
+                    logger.error("Yandex GPT %s: %s", tag, e)
+                    self._handle_error(status, tag)
+                    return None
+
+            message = str(e)
+            if isinstance(e, RuntimeError) and "Session is closed" in message:
                 logger.critical("Session closed during request! Disabling service.")
                 self.active = False
-                self._handle_error(500, "Session closed", {})
-            else:
-                logger.error(f"Runtime error in YandexGPT: {str(e)}")
-                self._handle_error(500, str(e), {})
-            return None
-        except aiohttp.ClientConnectionError as e:
-            logger.error(f"Connection error: {str(e)}")
-            self._handle_error(503, "Connection error", {})
-            return None
-        except Exception as e:
-            logger.error(f"Yandex GPT enhancement error: {str(e)}", exc_info=True)
-            self._handle_error(500, str(e), {})
+                self._handle_error(500, "Session closed")
+                return None
+
+            # Трассировка форматируется только при отладке
+            logger.error("Yandex GPT enhancement error: %s", message, exc_info=logger.isEnabledFor(logging.DEBUG))
+            self._handle_error(500, message)
             return None
 
-    def _handle_error(self, status: int, error: str, request_data: dict):
-        """Обрабатывает ошибки и обновляет счетчики"""
+    async def enhance_many(self, items: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+        """
+        Улучшает несколько пар (title, description) параллельно
+        Количество одновременных запросов ограничено MAX_CONCURRENT_GPT_REQUESTS,
+        результаты возвращаются в порядке входных данных (None при ошибке)
+        """
+        async def _one(title: str, description: str) -> Optional[Dict]:
+            async with self._semaphore:
+                return await self.enhance(title, description)
+
+        # enhance сам обрабатывает ошибки, поэтому задачи группы не отменяют друг друга
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(_one(title, description)) for title, description in items]
+        return [task.result() for task in tasks]
+
+    def _handle_error(self, status: int, error: str, request_body: bytes = b''):
+        """
+        Обрабатывает ошибки и обновляет счетчики
+        Вызывается только из цикла событий, поэтому счетчики - обычные int без блокировок
+        """
+        consecutive_errors = self.consecutive_errors + 1
+        self.consecutive_errors = consecutive_errors
         self.error_count += 1
-        self.consecutive_errors += 1
         self.stats['yagpt_errors'] += 1
         
-        logger.error(f"Yandex GPT API error: {status} - {error[:500]}")
-        logger.debug(f"Request body: {json.dumps(request_data, ensure_ascii=False)[:500]}...")
+        # Текст ошибки обрезается самим логгером (%.500s) и только если запись будет выведена
+        logger.error("Yandex GPT API error: %s - %.500s", status, error)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request body: %s...", request_body[:500].decode(errors='replace'))
         
         # Автоотключение при частых ошибках
-        if self.consecutive_errors >= self.max_consecutive_errors:
+        if consecutive_errors >= self.max_consecutive_errors:
             logger.warning("Disabling YandexGPT due to consecutive errors")
             self.active = False
 
@@ -235,22 +460,12 @@ class AsyncYandexGPT:
         if not text:
             return True
 
-        quality_indicators = [
-            "в интернете есть много сайтов",
-            "посмотрите, что нашлось в поиске",
-            "дополнительные материалы:",
-            "смотрите также:",
-            "читайте далее",
-            "читайте также",
-            "рекомендуем прочитать",
-            "подробнее на сайте",
-            "другие источники:",
-            "больше информации можно найти",
-            r"\[.*\]\(https?://[^\)]+\)"  # Markdown ссылки
-        ]
-
         text_lower = text.lower()
-        return any(re.search(phrase, text_lower) for phrase in quality_indicators)
+        if _QUALITY_AUTOMATON is not None:
+            has_phrase = next(_QUALITY_AUTOMATON.iter(text_lower), None) is not None
+        else:
+            has_phrase = any(phrase in text_lower for phrase in _QUALITY_SUBSTRINGS)
+        return has_phrase or _QUALITY_RE.search(text_lower) is not None
 
     def parse_response(self, data: Dict) -> Optional[Dict]:
         try:
@@ -259,15 +474,15 @@ class AsyncYandexGPT:
                 return None
 
             text = data['result']['alternatives'][0]['message']['text']
-            logger.debug(f"Response text: {text[:200]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response text: %s...", text[:200])
 
-            # Попытка прямого JSON парсинга
+            # Попытка прямого JSON парсинга: объект разбирается с первой '{' до парной '}'
+            # за один проход C-сканера json, хвост после объекта не просматривается
             try:
                 start_idx = text.find('{')
-                end_idx = text.rfind('}')
-                if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                    json_str = text[start_idx:end_idx+1]
-                    result = json.loads(json_str)
+                if start_idx != -1:
+                    result, _ = _JSON_DECODER.raw_decode(text, start_idx)
                     if isinstance(result, dict) and 'title' in result and 'description' in result:
                         return {
                             'title': self._sanitize_text(result['title'])[:self.config.MAX_TITLE_LENGTH],
@@ -276,23 +491,14 @@ class AsyncYandexGPT:
             except (ValueError, json.JSONDecodeError, AttributeError):
                 pass
 
-            # Расширенные шаблоны для извлечения данных
-            patterns = [
-                r'(?i)title["\']?:\s*["\'](.+?)["\']',
-                r'(?i)заголовок["\']?:\s*["\'](.+?)["\']',
-                r'(?i)(?:title|заголовок)[\s:]*["\']?(.+?)["\']?(?:\n|$|\.)',
-                r'(?i)(?:description|описание)[\s:]*["\']?(.+?)["\']?(?:\n|$|\.)',
-                r'{"title"\s*:\s*"([^"]+)"[^}]*"description"\s*:\s*"([^"]+)"}',
-                r'<title>(.+?)</title>\s*<description>(.+?)</description>',
-                r'(?i)(?:заголовок|title):?\s*([^\n]+)\n+(?:описание|description):?\s*([^\n]+)'
-            ]
-
             title_match = None
             desc_match = None
+            # Каждый шаблон выполняется не более одного раза: совпадения переиспользуются для описания
+            matches = {}
 
             # Поиск заголовка
-            for pattern in patterns:
-                match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+            for pattern in _PARSE_PATTERNS:
+                match = matches[pattern] = pattern.search(text)
                 if match and match.lastindex >= 1:
                     title_candidate = match.group(1).strip()
                     if len(title_candidate) > 5:
@@ -301,8 +507,8 @@ class AsyncYandexGPT:
 
             # Поиск описания
             if title_match:
-                for pattern in patterns:
-                    match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+                for pattern in _PAIR_PATTERNS:
+                    match = matches[pattern] if pattern in matches else pattern.search(text)
                     if match and match.lastindex >= 2:
                         desc_candidate = match.group(2).strip()
                         if len(desc_candidate) > 10:
@@ -311,12 +517,12 @@ class AsyncYandexGPT:
 
             # Fallback стратегии
             if not title_match or not desc_match:
-                parts = re.split(r'\n\n|\n-|\n•', text, maxsplit=1)
+                parts = _PARAGRAPH_SPLIT_RE.split(text, maxsplit=1)
                 if len(parts) >= 2:
                     title_match = parts[0].strip()
                     desc_match = parts[1].strip()
                 else:
-                    sentences = re.split(r'[.!?]\s+', text)
+                    sentences = _SENTENCE_SPLIT_RE.split(text)
                     if len(sentences) > 1:
                         title_match = sentences[0]
                         desc_match = ' '.join(sentences[1:3])[:500]
@@ -338,12 +544,4 @@ class AsyncYandexGPT:
         """Sanitizes text for Telegram HTML parsing"""
         if not text:
             return ""
-        sanitized = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', str(text))
-        return (
-            sanitized
-            .replace('&', '&amp;')
-            .replace('<', '&lt;')
-            .replace('>', '&gt;')
-            .replace('"', '&quot;')
-            .replace("'", "&apos;")
-        )
\ No newline at end of file
+        return _sanitize_html(str(text))
\ No newline at end of file